@@ -0,0 +1,249 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Move hints and threat detection for Kuba, computed in the background while a game is played.
+
+import threading
+from KubaSearch import KubaLocalTable, SearchCancelled, negamax, decode_move, NO_MOVE
+
+
+def find_threats(game):
+    """
+    Returns the moves the opponent of the player to move could use to push a marble off the board if it were their
+    turn. Before the first move, the threats of both players are returned.
+    :param game: KubaGame object. It is not changed.
+    :return: List of Tuple (String, Tuple (Int, Int), String, String), each move as (playername, coordinates, direction)
+        followed by the color of the marble it would push off.
+    """
+    board = game.get_position()
+    slots = (0, 1) if board[3] is None else (1 - board[3],)
+    threats = []
+    for slot in slots:
+        # Hand the turn to the threatening player on a copy of the game.
+        copy = game.copy()
+        copy.set_position(board[:3] + (slot,) + board[4:])
+        position = copy.get_position()
+        before = copy.get_marble_count()
+        for move in copy.get_possible_moves():
+            if copy.make_move(*move):
+                after = copy.get_marble_count()
+                copy.set_position(position)
+                for color, count_before, count_after in zip(('W', 'B', 'R'), before, after):
+                    if count_after < count_before:
+                        threats.append(move + (color,))
+    return threats
+
+
+class KubaAnalyzer:
+    """
+    Searches a KubaGame in a background thread and follows the game as moves are made. The best line found so far can
+    be read at any time without waiting for the search. When a move is made the running search is cancelled and a new
+    one starts on the new position. If the move was the one the analyzer predicted, the new search keeps the
+    transposition table and starts from the rest of the predicted line.
+    """
+    def __init__(self, game, max_depth=6, time_limit=None):
+        """
+        Initializes an analyzer for a game. Call start to begin searching.
+        :param game: KubaGame object, the game to analyze.
+        :param max_depth: Integer, the deepest search to run on a position.
+        :param time_limit: Float, the number of seconds to spend on each position, otherwise None for no limit.
+        """
+        self._game = game
+        self._max_depth = max_depth
+        self._time_limit = time_limit
+        self._table = KubaLocalTable()
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._stop = None
+        self._timer = None
+        self._generation = 0
+        self._result = {'depth': 0, 'score': None, 'line': []}
+        self._threats = None
+        self._finished = False
+
+    def start(self):
+        """
+        Starts following the game and searching its current position.
+        :return: Nothing.
+        """
+        self._game.add_listener(self._on_move)
+        self._restart(self._game.copy(), None)
+
+    def stop(self):
+        """
+        Stops the search and stops following the game.
+        :return: Nothing.
+        """
+        self._game.remove_listener(self._on_move)
+        with self._lock:
+            self._generation += 1
+            if self._stop is not None:
+                self._stop.set()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._updated.notify_all()
+
+    def get_best_line(self, wait=0):
+        """
+        Returns the deepest completed result for the current position.
+        :param wait: Float, the number of seconds to wait for a first result if none is available yet.
+        :return: Dictionary holding the 'depth' searched, the 'score' for the player to move and the best 'line' of moves
+            as (playername, coordinates, direction) tuples.
+        """
+        with self._lock:
+            if not self._result['line'] and wait:
+                self._updated.wait_for(lambda: self._result['line'] or self._finished, wait)
+            return {'depth': self._result['depth'], 'score': self._result['score'], 'line': list(self._result['line'])}
+
+    def wait_for_depth(self, depth, timeout):
+        """
+        Waits until the search of the current position has completed a given depth or can go no deeper. Callers that
+        want a bounded amount of analysis use this; the move path never does.
+        :param depth: Integer, the depth to wait for.
+        :param timeout: Float, the most seconds to wait.
+        :return: Dictionary, the best line as returned by get_best_line.
+        """
+        with self._lock:
+            self._updated.wait_for(lambda: self._finished or self._result['depth'] >= depth, timeout)
+        return self.get_best_line()
+
+    def get_hint(self, wait=0):
+        """
+        Returns the best move found so far for the player to move.
+        :param wait: Float, the number of seconds to wait for a first result if none is available yet.
+        :return: Tuple (String, Tuple (Int, Int), String), otherwise None if no move has been found yet.
+        """
+        line = self.get_best_line(wait)['line']
+        return line[0] if line else None
+
+    def get_threats(self, wait=0):
+        """
+        Returns the opponent's threats in the current position, as found by find_threats.
+        :param wait: Float, the number of seconds to wait for them if they have not been computed yet.
+        :return: List of threats, otherwise None if they have not been computed yet.
+        """
+        with self._lock:
+            if self._threats is None and wait:
+                self._updated.wait_for(lambda: self._threats is not None, wait)
+            return self._threats
+
+    def _on_move(self, event):
+        """
+        Listener called by the game after each move. Cancels the running search and starts one on the new position.
+        :param event: Dictionary, a move event from KubaGame.
+        :return: Nothing.
+        """
+        with self._lock:
+            line = self._result['line']
+        move = (event['player'], event['coordinates'], event['direction'])
+        predicted = line[1:] if line and line[0] == move else None
+        self._restart(self._game.copy(), predicted)
+
+    def _restart(self, game, predicted):
+        """
+        Cancels any running search and starts a new one on a copy of the game.
+        :param game: KubaGame object, a private copy of the position to search.
+        :param predicted: List of moves, the remainder of the predicted line if the last move was predicted, otherwise
+            None.
+        :return: Nothing.
+        """
+        stop = threading.Event()
+        timer = None
+        if self._time_limit is not None:
+            timer = threading.Timer(self._time_limit, stop.set)
+            timer.daemon = True
+        with self._lock:
+            if self._stop is not None:
+                self._stop.set()
+            # The old search is cancelled, so its time limit no longer matters.
+            if self._timer is not None:
+                self._timer.cancel()
+            self._stop = stop
+            self._timer = timer
+            self._generation += 1
+            generation = self._generation
+            if predicted is None:
+                self._table = KubaLocalTable()
+                self._result = {'depth': 0, 'score': None, 'line': []}
+            else:
+                score = self._result['score']
+                self._result = {'depth': max(0, self._result['depth'] - 1),
+                                'score': None if score is None else -score, 'line': predicted}
+            self._threats = None
+            self._finished = False
+            table = self._table
+
+        if timer is not None:
+            timer.start()
+        worker = threading.Thread(target=self._search, args=(game, table, stop, generation), daemon=True)
+        worker.start()
+
+    def _search(self, game, table, stop, generation):
+        """
+        Runs in the worker thread: finds the threats, then searches one move deeper at a time until cancelled.
+        :param game: KubaGame object, a private copy of the position.
+        :param table: KubaLocalTable object.
+        :param stop: threading.Event, set to cancel the search.
+        :param generation: Integer, identifies this search so stale results are discarded.
+        :return: Nothing.
+        """
+        try:
+            threats = find_threats(game)
+            if not self._publish(generation, threats=threats):
+                return
+            position = game.get_position()
+            for depth in range(1, self._max_depth + 1):
+                try:
+                    score, move = negamax(game, depth, table=table, stop=stop)
+                except SearchCancelled:
+                    return
+                if move is None:
+                    return
+                game.set_position(position)
+                line = self._principal_line(game, table, depth, move)
+                game.set_position(position)
+                if not self._publish(generation, result={'depth': depth, 'score': score, 'line': line}):
+                    return
+        finally:
+            self._publish(generation, finished=True)
+
+    def _principal_line(self, game, table, depth, move):
+        """
+        Follows the best moves stored in the table from the searched position.
+        :param game: KubaGame object at the searched position. It is left at the end of the line.
+        :param table: KubaLocalTable object, the table filled by the search.
+        :param depth: Integer, the longest line to return.
+        :param move: Tuple, the best first move.
+        :return: List of moves.
+        """
+        line = []
+        while move is not None and len(line) < depth and game.make_move(*move):
+            line.append(move)
+            entry = table.probe(game.get_position_key())
+            move = None
+            if entry is not None and entry[3] != NO_MOVE and game.get_current_turn() is not None:
+                coordinates, direction = decode_move(entry[3])
+                move = (game.get_current_turn(), coordinates, direction)
+        return line
+
+    def _publish(self, generation, result=None, threats=None, finished=False):
+        """
+        Stores results from a worker, unless a newer search has started since.
+        :param generation: Integer, the worker's search.
+        :param result: Dictionary, a completed search depth, otherwise None.
+        :param threats: List of threats, otherwise None.
+        :param finished: Boolean, the worker has stopped searching.
+        :return: True or False, is the worker's search still current.
+        """
+        with self._lock:
+            if generation != self._generation:
+                return False
+            if result is not None and result['depth'] >= self._result['depth']:
+                self._result = result
+            if threats is not None:
+                self._threats = threats
+            if finished:
+                self._finished = True
+            self._updated.notify_all()
+            return True
+
@@ -0,0 +1,80 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for Kuba move hints and threats.
+
+import threading
+import unittest
+from KubaGame import KubaGame
+from KubaAnalysis import find_threats
+
+
+class TestAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.game.make_move('PlayerA', (5, 5), 'F')
+        self.game.make_move('PlayerB', (5, 0), 'R')
+
+    def test_find_threats(self):
+        self.assertEqual(find_threats(self.game), [])
+        self.game.make_move('PlayerA', (4, 5), 'F')
+        self.assertEqual(find_threats(self.game), [('PlayerA', (3, 5), 'F', 'B')])
+        self.assertEqual(self.game.get_current_turn(), 'PlayerB')
+
+    def test_hint(self):
+        analyzer = self.game.start_analysis(max_depth=3)
+        try:
+            result = analyzer.wait_for_depth(3, 10)
+            self.assertEqual(result['depth'], 3)
+            self.assertEqual(result['line'][0], ('PlayerA', (4, 5), 'F'))
+            self.assertEqual(analyzer.get_threats(wait=1), [])
+        finally:
+            analyzer.stop()
+
+    def test_follows_predicted_move(self):
+        analyzer = self.game.start_analysis(max_depth=3)
+        try:
+            line = analyzer.wait_for_depth(3, 10)['line']
+            self.game.make_move(*line[0])
+            # The rest of the predicted line is available straight away.
+            result = analyzer.get_best_line()
+            self.assertGreaterEqual(result['depth'], 2)
+            self.assertEqual(result['line'][0][0], 'PlayerB')
+            result = analyzer.wait_for_depth(3, 10)
+            self.assertEqual(result['depth'], 3)
+            self.assertEqual(result['line'][0][0], 'PlayerB')
+        finally:
+            analyzer.stop()
+
+    def test_restarts_on_other_move(self):
+        analyzer = self.game.start_analysis(max_depth=2)
+        try:
+            analyzer.wait_for_depth(2, 10)
+            self.game.make_move('PlayerA', (6, 6), 'L')
+            result = analyzer.wait_for_depth(2, 10)
+            self.assertEqual(result['line'][0][0], 'PlayerB')
+            self.assertEqual(analyzer.get_threats(wait=1), find_threats(self.game))
+        finally:
+            analyzer.stop()
+
+    def test_stop(self):
+        analyzer = self.game.start_analysis(max_depth=2)
+        analyzer.stop()
+        self.game.make_move('PlayerA', (4, 5), 'F')
+        self.assertEqual(self.game._listeners, [])
+
+    def test_time_limit_timers_cancelled(self):
+        analyzer = self.game.start_analysis(max_depth=2, time_limit=60)
+        for num in range(3):
+            self.assertTrue(any(self.game.make_move(*move) for move in self.game.get_possible_moves()))
+        timers = [thread for thread in threading.enumerate() if isinstance(thread, threading.Timer)]
+        self.assertEqual(len([timer for timer in timers if not timer.finished.is_set()]), 1)
+        analyzer.stop()
+        for timer in timers:
+            timer.join(1)
+        self.assertFalse(any(timer.is_alive() for timer in timers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Streaming statistics over archived Kuba games, replayed in a single pass and merged across processes.
+
+import json
+import sys
+from collections import Counter
+from multiprocessing import Pool
+from KubaGame import KubaGame, parse_coordinates
+
+
+def read_archive(lines):
+    """
+    Reads archived games in the batch session format: a 'new PlayerA PlayerB' line starts each game and is followed by
+    its 'move playername row column direction' lines. Other commands, blank lines, comments and malformed moves are
+    skipped. Games are yielded one at a time, so only one game is held in memory.
+    :param lines: Iterable of Strings.
+    :return: Generator of Tuple (Tuple (String, String), List of moves), the player names and the moves of each game.
+    """
+    players = None
+    moves = []
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if parts[0] == "new" and len(parts) == 3:
+            if players is not None:
+                yield players, moves
+            players = (parts[1], parts[2])
+            moves = []
+        elif parts[0] == "move" and len(parts) == 5 and players is not None:
+            coordinates = parse_coordinates(parts[2], parts[3])
+            if coordinates is not None:
+                moves.append((parts[1], coordinates, parts[4]))
+    if players is not None:
+        yield players, moves
+
+
+class KubaStats:
+    """
+    Aggregate statistics over many games. Memory use is fixed: captures are tallied per ply up to max_ply, and every
+    later ply shares the last bucket. Partial statistics from separate workers are combined with merge.
+    """
+    def __init__(self, max_ply=200):
+        """
+        Initializes empty statistics.
+        :param max_ply: Integer, the last ply with its own capture bucket.
+        """
+        self._max_ply = max_ply
+        self.games = 0
+        self.decided = 0
+        self.first_mover_wins = 0
+        self.plies = 0
+        self.ko_rejections = 0
+        self.games_with_ko = 0
+        self.invalid_moves = 0
+        self.captures_by_ply = [Counter() for num in range(max_ply + 1)]
+
+    def add_game(self, players, moves):
+        """
+        Replays one game and adds it to the statistics. When make_move refuses a move, the restored position is asked
+        whether the move was otherwise possible, so a move refused only by the Ko rule is counted as a Ko rejection.
+        :param players: Tuple (String, String), the player names. The first plays White.
+        :param moves: Iterable of moves as (playername, coordinates, direction).
+        :return: Nothing.
+        """
+        game = KubaGame((players[0], 'W'), (players[1], 'B'))
+        first_mover = None
+        ply = 0
+        ko_rejections = 0
+        counts = game.get_marble_count()
+
+        for playername, coordinates, direction in moves:
+            if game.make_move(playername, coordinates, direction):
+                if first_mover is None:
+                    first_mover = playername
+                after = game.get_marble_count()
+                if after != counts:
+                    bucket = self.captures_by_ply[min(ply, self._max_ply)]
+                    for color, count_before, count_after in zip(('W', 'B', 'R'), counts, after):
+                        if count_after < count_before:
+                            bucket[color] += 1
+                    counts = after
+                ply += 1
+            elif game.is_possible_move(playername, coordinates, direction):
+                ko_rejections += 1
+            else:
+                self.invalid_moves += 1
+
+        self.games += 1
+        self.plies += ply
+        self.ko_rejections += ko_rejections
+        if ko_rejections:
+            self.games_with_ko += 1
+        if game.get_winner() is not None:
+            self.decided += 1
+            if game.get_winner() == first_mover:
+                self.first_mover_wins += 1
+
+    def merge(self, other):
+        """
+        Adds another set of statistics into this one.
+        :param other: KubaStats object with the same max_ply.
+        :return: This KubaStats object.
+        """
+        self.games += other.games
+        self.decided += other.decided
+        self.first_mover_wins += other.first_mover_wins
+        self.plies += other.plies
+        self.ko_rejections += other.ko_rejections
+        self.games_with_ko += other.games_with_ko
+        self.invalid_moves += other.invalid_moves
+        for bucket, other_bucket in zip(self.captures_by_ply, other.captures_by_ply):
+            bucket.update(other_bucket)
+        return self
+
+    def summary(self):
+        """
+        Returns the headline figures.
+        :return: Dictionary holding the number of games, the first mover's win rate among decided games, the average
+            game length in moves, the average Ko rejections per game, the share of games with a Ko rejection, the
+            number of invalid moves and the captures of each color by ply.
+        """
+        return {'games': self.games,
+                'decided': self.decided,
+                'first_move_win_rate': self.first_mover_wins / self.decided if self.decided else None,
+                'average_length': self.plies / self.games if self.games else None,
+                'ko_per_game': self.ko_rejections / self.games if self.games else None,
+                'games_with_ko': self.games_with_ko / self.games if self.games else None,
+                'invalid_moves': self.invalid_moves,
+                'captures_by_ply': {ply: dict(bucket) for ply, bucket in enumerate(self.captures_by_ply) if bucket}}
+
+
+def analyze_lines(lines, max_ply=200):
+    """
+    Computes statistics over an archive in a single streaming pass.
+    :param lines: Iterable of Strings in the batch session format.
+    :param max_ply: Integer, the last ply with its own capture bucket.
+    :return: KubaStats object.
+    """
+    stats = KubaStats(max_ply)
+    for players, moves in read_archive(lines):
+        stats.add_game(players, moves)
+    return stats
+
+
+def analyze_file(path, max_ply=200):
+    """
+    Computes statistics over one archive file.
+    :param path: String, the path of the archive.
+    :param max_ply: Integer, the last ply with its own capture bucket.
+    :return: KubaStats object.
+    """
+    with open(path) as archive:
+        return analyze_lines(archive, max_ply)
+
+
+def _analyze_task(task):
+    """
+    Unpacks a task for analyze_file so it can be handed to a process pool.
+    :param task: Tuple (String, Int), the path and max_ply.
+    :return: KubaStats object.
+    """
+    return analyze_file(*task)
+
+
+def analyze_files(paths, processes=None, max_ply=200):
+    """
+    Computes statistics over many archive files, one file per task in a pool of worker processes, and merges the
+    partial results.
+    :param paths: Iterable of Strings, the archive paths.
+    :param processes: Integer, the number of workers. Defaults to one per core; 1 runs in this process.
+    :param max_ply: Integer, the last ply with its own capture bucket.
+    :return: KubaStats object.
+    """
+    tasks = [(path, max_ply) for path in paths]
+    stats = KubaStats(max_ply)
+    if processes == 1:
+        for partial in map(_analyze_task, tasks):
+            stats.merge(partial)
+    else:
+        with Pool(processes) as pool:
+            for partial in pool.imap_unordered(_analyze_task, tasks):
+                stats.merge(partial)
+    return stats
+
+
+def main():
+    # Usage: python KubaAnalytics.py archive [archive ...] [--processes=N]
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    processes = None
+    for arg in sys.argv[1:]:
+        if arg.startswith("--processes="):
+            processes = int(arg.split("=")[1])
+    print(json.dumps(analyze_files(paths, processes).summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
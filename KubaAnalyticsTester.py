@@ -0,0 +1,60 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for Kuba archive statistics.
+
+import os
+import tempfile
+import unittest
+from KubaAnalytics import read_archive, analyze_lines, analyze_files
+
+WIN_GAME = ["new PlayerA PlayerB", "move PlayerA 1 0 R", "move PlayerB 0 6 B", "move PlayerA 1 1 R",
+            "move PlayerB 1 6 B", "move PlayerA 1 3 B", "move PlayerB 2 6 B", "move PlayerA 2 3 B",
+            "move PlayerB 3 6 B", "move PlayerA 3 3 B", "move PlayerB 4 6 B", "move PlayerA 4 3 B",
+            "move PlayerB 6 0 F", "move PlayerA 5 3 B", "move PlayerB 5 0 F", "move PlayerA 1 2 B",
+            "move PlayerB 4 0 F", "move PlayerA 2 2 B", "move PlayerB 3 0 F", "move PlayerA 3 2 B",
+            "move PlayerB 2 0 F", "move PlayerA 4 2 B", "move PlayerB 0 0 R", "move PlayerA 5 2 B"]
+KO_GAME = ["new PlayerC PlayerD", "move PlayerC 6 5 F", "move PlayerD 0 5 B", "move PlayerC 5 5 F",
+           "move PlayerD 0 5 B", "count", "move PlayerC 0 0 R", "move PlayerD 5 0 R", "move PlayerC 4 5 F"]
+
+
+class TestAnalytics(unittest.TestCase):
+    def test_read_archive(self):
+        games = list(read_archive(["# archive", "move PlayerA 6 5 F"] + KO_GAME[:3] + ["move PlayerC x 5 F"]))
+        self.assertEqual(games, [(('PlayerC', 'PlayerD'), [('PlayerC', (6, 5), 'F'), ('PlayerD', (0, 5), 'B')])])
+
+    def test_statistics(self):
+        summary = analyze_lines(WIN_GAME + KO_GAME).summary()
+        self.assertEqual(summary['games'], 2)
+        self.assertEqual(summary['decided'], 1)
+        self.assertEqual(summary['first_move_win_rate'], 1.0)
+        self.assertEqual(summary['average_length'], (23 + 5) / 2)
+        self.assertEqual(summary['ko_per_game'], 0.5)
+        self.assertEqual(summary['games_with_ko'], 0.5)
+        self.assertEqual(summary['invalid_moves'], 1)
+        self.assertEqual(summary['captures_by_ply'][4], {'B': 1})
+        self.assertEqual(sum(bucket.get('R', 0) for bucket in summary['captures_by_ply'].values()), 7)
+
+    def test_bounded_ply_buckets(self):
+        summary = analyze_lines(WIN_GAME, max_ply=10).summary()
+        self.assertEqual(max(summary['captures_by_ply']), 10)
+
+    def test_parallel_files_match_single_pass(self):
+        directory = tempfile.mkdtemp()
+        paths = []
+        for number, lines in enumerate([WIN_GAME, KO_GAME, KO_GAME + WIN_GAME]):
+            path = os.path.join(directory, "archive%d.txt" % number)
+            with open(path, "w") as archive:
+                archive.write("\n".join(lines))
+            paths.append(path)
+        try:
+            expected = analyze_lines(WIN_GAME + KO_GAME + KO_GAME + WIN_GAME).summary()
+            self.assertEqual(analyze_files(paths, processes=2).summary(), expected)
+            self.assertEqual(analyze_files(paths, processes=1).summary(), expected)
+        finally:
+            for path in paths:
+                os.remove(path)
+            os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Seeded random-play fuzzer that checks an alternative Kuba engine against KubaGame move by move.
+
+import random
+import sys
+from multiprocessing import Pool
+from KubaGame import KubaGame
+
+PLAYERS = (('PlayerA', 'W'), ('PlayerB', 'B'))
+DIRECTIONS = ('L', 'R', 'F', 'B')
+OPPOSITE = {'L': 'R', 'R': 'L', 'F': 'B', 'B': 'F'}
+MOMENTUM = {'L': (0, -1), 'R': (0, 1), 'F': (-1, 0), 'B': (1, 0)}
+
+
+def generate_game(rng, max_moves=200, adversarial=0.3):
+    """
+    Plays a random game on a reference KubaGame and returns the moves that were attempted, legal or not. Most moves push
+    one of the current player's marbles. A share of the moves are adversarial: moves by the wrong or an unknown player,
+    off-board coordinates, unknown directions, pushes that would knock the player's own marble off, and repeated or
+    reversed pushes that aim to trigger the Ko rule. Either player may make the first move.
+    :param rng: random.Random object, the source of randomness.
+    :param max_moves: Integer, the number of moves to attempt before stopping.
+    :param adversarial: Float between 0 and 1, the share of moves chosen adversarially.
+    :return: List of Tuple (String, Tuple (Int, Int), String), the moves as (playername, coordinates, direction).
+    """
+    game = KubaGame(*PLAYERS)
+    moves = []
+    last_move = {}
+    names = [name for name, color in PLAYERS]
+
+    while len(moves) < max_moves and game.get_winner() is None:
+        playername = game.get_current_turn()
+        if playername is None:
+            playername = rng.choice(names)
+        color = PLAYERS[names.index(playername)][1]
+
+        if rng.random() < adversarial:
+            choice = rng.randrange(6)
+            opponent = names[1 - names.index(playername)]
+            if choice == 0:
+                move = (rng.choice([opponent, 'Nobody']), (rng.randrange(7), rng.randrange(7)), rng.choice(DIRECTIONS))
+            elif choice == 1:
+                move = (playername, (rng.randrange(-1, 8), rng.randrange(-1, 8)), rng.choice(DIRECTIONS + ('X',)))
+            elif choice == 2 and playername in last_move:
+                # Repeat this player's previous push.
+                move = last_move[playername]
+            elif choice == 3 and opponent in last_move:
+                # Push back the marble the opponent just moved.
+                name, coordinates, direction = last_move[opponent]
+                momentum = MOMENTUM[direction]
+                move = (playername, (coordinates[0] + momentum[0], coordinates[1] + momentum[1]), OPPOSITE[direction])
+            else:
+                # Push an own marble toward the edge it sits on, which is illegal if it would fall off.
+                coordinates = _random_marble(rng, game, color)
+                edges = [direction for direction, edge in (('F', coordinates[0] == 0), ('B', coordinates[0] == 6),
+                                                           ('L', coordinates[1] == 0), ('R', coordinates[1] == 6)) if edge]
+                move = (playername, coordinates, rng.choice(edges or DIRECTIONS))
+        else:
+            move = (playername, _random_marble(rng, game, color), rng.choice(DIRECTIONS))
+
+        moves.append(move)
+        if game.make_move(*move):
+            last_move[move[0]] = move
+
+    return moves
+
+
+def _random_marble(rng, game, color):
+    """
+    Picks the location of a random marble of the given color.
+    :param rng: random.Random object.
+    :param game: KubaGame object.
+    :param color: String, the marble color.
+    :return: Tuple (Int, Int), a location holding a marble of color, otherwise any location if there are none.
+    """
+    locations = [(row, column) for row in range(7) for column in range(7) if game.get_marble((row, column)) == color]
+    if not locations:
+        return rng.randrange(7), rng.randrange(7)
+    return rng.choice(locations)
+
+
+def observe(game):
+    """
+    Captures everything a caller can see of a game through its public methods.
+    :param game: KubaGame or compatible engine object.
+    :return: Tuple, the observable state of the game.
+    """
+    board = tuple(game.get_marble((row, column)) for row in range(7) for column in range(7))
+    captured = tuple(game.get_captured(name) for name, color in PLAYERS)
+    return game.get_current_turn(), game.get_winner(), captured, tuple(game.get_marble_count()), board
+
+
+def compare(engine_factory, moves):
+    """
+    Replays a sequence of moves on KubaGame and on an alternative engine side by side, comparing the result of every
+    move and the observable state after it.
+    :param engine_factory: Callable taking two (name, color) tuples and returning an engine with the KubaGame interface.
+    :param moves: List of moves as (playername, coordinates, direction).
+    :return: Tuple (Int, String) giving the index of the first diverging move and a description, otherwise None if the
+        engines agree on every move.
+    """
+    reference = KubaGame(*PLAYERS)
+    engine = engine_factory(*PLAYERS)
+    for index, move in enumerate(moves):
+        try:
+            expected = reference.make_move(*move), observe(reference)
+        except Exception as error:
+            return index, "reference raised %r on %r" % (error, move)
+        try:
+            actual = engine.make_move(*move), observe(engine)
+        except Exception as error:
+            return index, "engine raised %r on %r" % (error, move)
+        if expected != actual:
+            return index, "move %r: expected %r, engine gave %r" % (move, expected, actual)
+    return None
+
+
+def shrink(engine_factory, moves):
+    """
+    Reduces a diverging move sequence to a minimal one that still diverges, by repeatedly removing chunks of moves and
+    then single moves while the divergence remains.
+    :param engine_factory: Callable returning the engine under test.
+    :param moves: List of moves that make the engines diverge.
+    :return: List of moves, a smaller sequence on which the engines still diverge.
+    """
+    failure = compare(engine_factory, moves)
+    if failure is None:
+        return moves
+
+    # Nothing after the first diverging move is needed.
+    moves = moves[:failure[0] + 1]
+    chunk = len(moves) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(moves):
+            candidate = moves[:start] + moves[start + chunk:]
+            if candidate and compare(engine_factory, candidate) is not None:
+                moves = candidate
+            else:
+                start += chunk
+        chunk //= 2
+    return moves
+
+
+def fuzz_seed(engine_factory, seed, games, max_moves=200, adversarial=0.3):
+    """
+    Fuzzes an engine with a block of games generated from a single seed.
+    :param engine_factory: Callable returning the engine under test.
+    :param seed: Integer, the seed for this block of games.
+    :param games: Integer, the number of games to play.
+    :param max_moves: Integer, the number of moves to attempt per game.
+    :param adversarial: Float between 0 and 1, the share of moves chosen adversarially.
+    :return: Tuple (Int, List), the number of moves checked and a list of failures as dictionaries holding the seed,
+        game number, minimal reproducer and description.
+    """
+    checked = 0
+    failures = []
+    for number in range(games):
+        rng = random.Random("%d:%d" % (seed, number))
+        moves = generate_game(rng, max_moves, adversarial)
+        checked += len(moves)
+        failure = compare(engine_factory, moves)
+        if failure is not None:
+            reproducer = shrink(engine_factory, moves)
+            failures.append({'seed': seed, 'game': number, 'moves': reproducer,
+                             'description': compare(engine_factory, reproducer)[1]})
+    return checked, failures
+
+
+def _fuzz_task(task):
+    """
+    Unpacks a task for fuzz_seed so it can be handed to a process pool.
+    :param task: Tuple of the arguments to fuzz_seed.
+    :return: The result of fuzz_seed.
+    """
+    return fuzz_seed(*task)
+
+
+def fuzz(engine_factory, seeds, games=100, max_moves=200, adversarial=0.3, processes=None):
+    """
+    Fuzzes an engine across many seeds, spreading the seeds over a pool of worker processes. The engine factory must be
+    importable by the workers, such as a class or function defined at module level.
+    :param engine_factory: Callable returning the engine under test.
+    :param seeds: Iterable of Integers, one block of games is played per seed.
+    :param games: Integer, the number of games per seed.
+    :param max_moves: Integer, the number of moves to attempt per game.
+    :param adversarial: Float between 0 and 1, the share of moves chosen adversarially.
+    :param processes: Integer, the number of worker processes. Defaults to one per core; 1 runs in this process.
+    :return: Tuple (Int, List), the total number of moves checked and every failure found.
+    """
+    tasks = [(engine_factory, seed, games, max_moves, adversarial) for seed in seeds]
+    if processes == 1:
+        results = map(_fuzz_task, tasks)
+    else:
+        pool = Pool(processes)
+        results = pool.imap_unordered(_fuzz_task, tasks)
+
+    checked = 0
+    failures = []
+    try:
+        for moves, found in results:
+            checked += moves
+            failures.extend(found)
+    finally:
+        if processes != 1:
+            pool.close()
+            pool.join()
+    return checked, failures
+
+
+def load_engine(path):
+    """
+    Imports an engine factory given as 'module:name'.
+    :param path: String, the module and attribute to import.
+    :return: Callable, the engine factory.
+    """
+    module_name, attribute = path.split(':')
+    module = __import__(module_name, fromlist=[attribute])
+    return getattr(module, attribute)
+
+
+def main():
+    # Usage: python KubaFuzzer.py [module:Engine] [first seed] [seed count] [games per seed] [processes]
+    args = sys.argv[1:]
+    engine_factory = load_engine(args[0]) if len(args) > 0 else KubaGame
+    first_seed = int(args[1]) if len(args) > 1 else 0
+    seed_count = int(args[2]) if len(args) > 2 else 8
+    games = int(args[3]) if len(args) > 3 else 100
+    processes = int(args[4]) if len(args) > 4 else None
+
+    checked, failures = fuzz(engine_factory, range(first_seed, first_seed + seed_count), games, processes=processes)
+    print("Checked", checked, "moves in", seed_count * games, "games.")
+    for failure in failures:
+        print("Seed", failure['seed'], "game", failure['game'], "diverges:", failure['description'])
+        for move in failure['moves']:
+            print("\t", move)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for the Kuba fuzzer.
+
+import random
+import unittest
+from KubaGame import KubaGame
+from KubaFuzzer import generate_game, compare, shrink, fuzz
+
+
+class NoKoGame(KubaGame):
+    """
+    An engine that forgets the Ko rule.
+    """
+    def _get_prev_board_state(self):
+        return None
+
+
+class FirstMoverGame(KubaGame):
+    """
+    An engine that only lets the first player open the game.
+    """
+    def make_move(self, playername, coordinates, direction):
+        if self.get_current_turn() is None and playername != self._player_1.get_playername():
+            return False
+        return super().make_move(playername, coordinates, direction)
+
+
+class CrashingGame(KubaGame):
+    """
+    An engine that fails on any move.
+    """
+    def make_move(self, playername, coordinates, direction):
+        raise ValueError("broken")
+
+
+class TestFuzzer(unittest.TestCase):
+    def test_deterministic(self):
+        moves_one = generate_game(random.Random(7))
+        moves_two = generate_game(random.Random(7))
+        self.assertEqual(moves_one, moves_two)
+
+    def test_reference_agrees_with_itself(self):
+        checked, failures = fuzz(KubaGame, range(2), games=10, processes=1)
+        self.assertGreater(checked, 0)
+        self.assertEqual(failures, [])
+
+    def test_ko_divergence_shrinks(self):
+        moves = [('PlayerA', (6, 5), 'F'), ('PlayerA', (0, 0), 'R'), ('PlayerB', (0, 5), 'B'),
+                 ('PlayerA', (5, 5), 'F'), ('PlayerA', (0, 0), 'R'), ('PlayerB', (0, 5), 'B')]
+        self.assertEqual(compare(NoKoGame, moves)[0], 5)
+        self.assertEqual(shrink(NoKoGame, moves), [('PlayerA', (6, 5), 'F'), ('PlayerB', (0, 5), 'B'),
+                                                   ('PlayerA', (5, 5), 'F'), ('PlayerB', (0, 5), 'B')])
+
+    def test_engine_error_is_labelled(self):
+        index, description = compare(CrashingGame, [('PlayerA', (6, 5), 'F')])
+        self.assertEqual(index, 0)
+        self.assertTrue(description.startswith("engine raised"))
+
+    def test_finds_ko_bug(self):
+        checked, failures = fuzz(NoKoGame, range(1), games=20, max_moves=100, processes=1)
+        self.assertNotEqual(failures, [])
+        self.assertIsNotNone(compare(NoKoGame, failures[0]['moves']))
+
+    def test_finds_turn_bug_in_parallel(self):
+        checked, failures = fuzz(FirstMoverGame, range(2), games=10, processes=2)
+        self.assertNotEqual(failures, [])
+        self.assertEqual(len(failures[0]['moves']), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
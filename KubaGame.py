@@ -2,20 +2,119 @@
 # Date: 2021-05-20
 # Description: An interactive, two-player, command-line version of the classic marble game Kuba.
 
+import sys
+
+# Modules only needed for serialization, analysis and the other optional subsystems are imported where they are used,
+# so that short-lived processes which only play games start quickly.
+
+# Binary encoding of a game: version, turn, winner, player colors, captured marbles, each player's captured marbles at
+# the end of their last turn, move count, then the board and each player's board at the end of their last turn packed
+# at 2 bits per space. The player names follow, each prefixed by its length.
+_FORMAT_VERSION = 1
+_HEADER_FORMAT = '<8BI13s13s13s'
+_RECORD_LENGTH_FORMAT = '<H'
+_NONE = 255
+_MARBLE_CODES = {None: 0, 'W': 1, 'B': 2, 'R': 3}
+_CODE_MARBLES = (None, 'W', 'B', 'R')
+# The four spaces stored in each possible byte of a packed board, built the first time a board is unpacked.
+_BYTE_MARBLES = []
+
+# Starting marble locations and counts, as pictured in KubaBoard.initialize_marbles. New boards copy these templates.
+_STARTING_SPACES = (('W', 'W', None, None, None, 'B', 'B'),
+                    ('W', 'W', None, 'R', None, 'B', 'B'),
+                    (None, None, 'R', 'R', 'R', None, None),
+                    (None, 'R', 'R', 'R', 'R', 'R', None),
+                    (None, None, 'R', 'R', 'R', None, None),
+                    ('B', 'B', None, 'R', None, 'W', 'W'),
+                    ('B', 'B', None, None, None, 'W', 'W'))
+_STARTING_COUNTS = {'W': 8, 'B': 8, 'R': 13}
+
+
+def _pack_spaces(spaces):
+    """
+    Packs a 7x7 board into 13 bytes, 2 bits per space in row order.
+    :param spaces: List of List of Strings, a board state. None packs as an empty board.
+    :return: Bytes.
+    """
+    value = 0
+    if spaces is not None:
+        codes = _MARBLE_CODES
+        for row in spaces:
+            for marble in row:
+                value = (value << 2) | codes[marble]
+    # Pad the 98 bits of spaces to a whole number of bytes.
+    return (value << 6).to_bytes(13, 'big')
+
+
+def _unpack_spaces(data):
+    """
+    Unpacks a board packed by _pack_spaces.
+    :param data: Bytes, 13 bytes.
+    :return: List of List of Strings, a board state.
+    """
+    table = _BYTE_MARBLES
+    if not table:
+        table.extend(tuple(_CODE_MARBLES[(byte >> shift) & 3] for shift in (6, 4, 2, 0)) for byte in range(256))
+    cells = []
+    for byte in data:
+        cells.extend(table[byte])
+    return [cells[index:index + 7] for index in range(0, 49, 7)]
+
+
+def dump_games(games):
+    """
+    Checkpoints many games into a single buffer.
+    :param games: Iterable of KubaGame objects.
+    :return: Bytes, the encoded games. Pass them to load_games to restore them.
+    """
+    import struct
+    length = struct.Struct(_RECORD_LENGTH_FORMAT)
+    parts = []
+    for game in games:
+        record = game.to_bytes()
+        parts.append(length.pack(len(record)))
+        parts.append(record)
+    return b''.join(parts)
+
+
+def load_games(data):
+    """
+    Restores every game checkpointed by dump_games.
+    :param data: Bytes, a buffer from dump_games.
+    :return: List of KubaGame objects.
+    """
+    import struct
+    record_length = struct.Struct(_RECORD_LENGTH_FORMAT)
+    view = memoryview(data)
+    games = []
+    offset = 0
+    while offset < len(view):
+        length = record_length.unpack_from(view, offset)[0]
+        offset += record_length.size
+        games.append(KubaGame.from_bytes(view[offset:offset + length]))
+        offset += length
+    return games
+
+
 class KubaGame:
     """
     A representation of a game of Kuba. Manages the overall state of the game, including whose turn it is, what the
     previous versions of the board were, and who has won. Communicates with an instance of KubaBoard to handle move
     validation and updating the board, and two instance of KubaPlayer to handle name, color, and marble capture checking.
     """
-    def __init__(self, player_1, player_2):
+    def __init__(self, player_1, player_2, debug=False):
         """
         Initializes a new game of Kuba.
         :param player_1: Tuple (String, String): Player name, Color.
         :param player_2: Tuple (String, String): Player name, Color.
+        :param debug: Boolean, cross-check the board's marble counts against a full scan whenever they are read.
         """
         self._player_1 = KubaPlayer(player_1)
         self._player_2 = KubaPlayer(player_2)
+        # Player index: _player_1 is always slot 0 and _player_2 is always slot 1, matching the values of _turn. If both
+        # players share a name, the name resolves to _player_1.
+        self._players = (self._player_1, self._player_2)
+        self._player_slots = {self._player_2.get_playername(): 1, self._player_1.get_playername(): 0}
         self._turn = None
         self._winner = None
         self._captured_marbles = dict()
@@ -23,21 +122,20 @@ class KubaGame:
         self._player_1_prev_player_state = None
         self._player_2_prev_board_state = None
         self._player_2_prev_player_state = None
-        self._board = KubaBoard()
+        self._debug = debug
+        self._board = KubaBoard(debug)
+        self._move_count = 0
+        self._listeners = []
 
     def get_current_turn(self):
         """
         Returns the name of the player whose turn it currently is. If no player has gone yet, returns None.
         :return: String, the name of the current player. Returns None if no player has gone yet.
         """
-        # Match _turn to playername.
-        if self._turn == 0:
-            return self._player_1.get_playername()
-        elif self._turn == 1:
-            return self._player_2.get_playername()
         # No moves have been made, _turn == None.
-        else:
-            return self._turn
+        if self._turn is None:
+            return None
+        return self._players[self._turn].get_playername()
 
     def get_winner(self):
         """
@@ -46,18 +144,72 @@ class KubaGame:
         """
         return self._winner
 
+    def get_move_count(self):
+        """
+        Returns the number of moves that have been successfully made so far.
+        :return: Integer, the number of moves made.
+        """
+        return self._move_count
+
+    def get_players(self):
+        """
+        Returns both players in slot order: the first player passed to the game is slot 0, the second is slot 1.
+        :return: Tuple (KubaPlayer, KubaPlayer).
+        """
+        return self._players
+
+    def get_player_slot(self, playername):
+        """
+        Returns the slot of a player in get_players.
+        :param playername: String, the name of a player.
+        :return: Integer, 0 or 1, otherwise None if no player has that name.
+        """
+        return self._player_slots.get(playername)
+
+    def get_turn_slot(self):
+        """
+        Returns the slot of the player whose turn it currently is.
+        :return: Integer, 0 or 1, otherwise None if no player has gone yet.
+        """
+        return self._turn
+
+    def get_board_state(self):
+        """
+        Returns a copy of the board.
+        :return: List of List of Strings, the marble in each space by row, with None for empty spaces.
+        """
+        return self._board.get_state()
+
+    def add_listener(self, listener):
+        """
+        Registers a callable to be told about every successful move. The listener is called with a dictionary holding
+        the move number ('ply'), the move itself ('player', 'coordinates', 'direction'), the spaces along the pushed line
+        and their new contents ('cells', a list of (coordinates, marble) pairs with None for empty spaces), the marble
+        pushed off the board ('captured', None if no marble fell), the player to move next ('turn') and the winner.
+        :param listener: Callable taking a single dictionary.
+        :return: Nothing.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Stops sending move events to a listener previously passed to add_listener.
+        :param listener: Callable.
+        :return: Nothing.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
     def get_captured(self, playername):
         """
         Returns the number of Red marbles that playername has captured.
         :param playername: String, the name of a player.
         :return: Integer, the number of Red marbles captured by playername.
         """
-        # Match playername to _player_1 or _player_2. Default to None if no match.
-        player = self._player_1 if self._player_1.get_playername() == playername else self._player_2 \
-            if self._player_2.get_playername() == playername else None
-
-        if player is not None:
-            return player.get_captured_marbles()
+        # Match playername to its slot. Default to None if no match.
+        slot = self._player_slots.get(playername)
+        if slot is not None:
+            return self._players[slot].get_captured_marbles()
 
     def get_marble(self, coordinates):
         """
@@ -79,6 +231,203 @@ class KubaGame:
         # Request count from _board.
         return self._board.get_marbles()
 
+    def start_analysis(self, max_depth=6, time_limit=None):
+        """
+        Starts searching the game for hints and threats in a background thread. The analysis follows the game as moves
+        are made and never delays make_move. Call stop on the returned analyzer when it is no longer needed.
+        :param max_depth: Integer, the deepest search to run on a position.
+        :param time_limit: Float, the number of seconds to spend on each position, otherwise None for no limit.
+        :return: KubaAnalyzer object.
+        """
+        # Imported here so games that never ask for analysis do not load the search.
+        from KubaAnalysis import KubaAnalyzer
+        analyzer = KubaAnalyzer(self, max_depth, time_limit)
+        analyzer.start()
+        return analyzer
+
+    def get_possible_moves(self):
+        """
+        Returns every move the player to move could make on the current board. If no one has gone yet, moves for both
+        players are included. The Ko rule is not applied here, so make_move may still reject a move that recreates the
+        player's previous board.
+        :return: List of Tuple (String, Tuple (Int, Int), String), the moves as (playername, coordinates, direction).
+        """
+        if self._winner is not None:
+            return []
+        slots = (0, 1) if self._turn is None else (self._turn,)
+        moves = []
+        for slot in slots:
+            player = self._players[slot]
+            playername = player.get_playername()
+            for location in self._board.get_locations(player.get_color()):
+                for direction in KubaBoard.DIRECTIONS:
+                    if self._board.validate_move(location, direction, player):
+                        moves.append((playername, location, direction))
+        return moves
+
+    def is_possible_move(self, playername, coordinates, direction):
+        """
+        Returns whether a move would be among get_possible_moves: the game is not over, it is the player's turn and the
+        board allows the push. As with get_possible_moves the Ko rule is not applied, so a move make_move has refused
+        while this returns True was refused by the Ko rule.
+        :param playername: String, the name of the player to move.
+        :param coordinates: Tuple (Int, Int), the location of the marble to push.
+        :param direction: String, 'L', 'R', 'F' or 'B'.
+        :return: True or False.
+        """
+        slot = self._player_slots.get(playername)
+        if slot is None or self._winner is not None or (self._turn is not None and slot != self._turn):
+            return False
+        return self._board.validate_move(coordinates, direction, self._players[slot])
+
+    def get_position(self):
+        """
+        Returns a snapshot of everything make_move reads or changes: the board, both players' captured marbles, the turn,
+        the winner, the move count and the board and captured marbles at the end of each player's last turn.
+        :return: Tuple, the position. Pass it to set_position to return to it.
+        """
+        return (self._board.get_state(), self._player_1.get_captured_marbles(), self._player_2.get_captured_marbles(),
+                self._turn, self._winner, self._move_count,
+                self._player_1_prev_board_state, self._player_1_prev_player_state,
+                self._player_2_prev_board_state, self._player_2_prev_player_state)
+
+    def set_position(self, position):
+        """
+        Returns the game to a position captured by get_position.
+        :param position: Tuple, a position from get_position.
+        :return: Nothing.
+        """
+        (board, captured_1, captured_2, self._turn, self._winner, self._move_count,
+         self._player_1_prev_board_state, self._player_1_prev_player_state,
+         self._player_2_prev_board_state, self._player_2_prev_player_state) = position
+        self._board.set_state(board)
+        self._player_1.set_captured_marbles(captured_1)
+        self._player_2.set_captured_marbles(captured_2)
+
+    def get_position_key(self):
+        """
+        Returns a compact key identifying the position for transposition tables: the packed board, the turn and both
+        players' captured marbles. The boards kept for the Ko rule are not included.
+        :return: Bytes, 16 bytes.
+        """
+        return (self._board.to_bytes() +
+                bytes((_NONE if self._turn is None else self._turn, self._player_1.get_captured_marbles(),
+                       self._player_2.get_captured_marbles())))
+
+    def to_bytes(self):
+        """
+        Encodes the whole game, including the state kept for the Ko rule, in a compact binary form. Player colors must be
+        'W' or 'B' and names at most 255 bytes of UTF-8.
+        :return: Bytes. Pass them to KubaGame.from_bytes to restore the game.
+        """
+        names = []
+        colors = 0
+        for player in self._players:
+            name = player.get_playername().encode('utf-8')
+            if len(name) > 255 or player.get_color() not in ('W', 'B'):
+                raise ValueError("Cannot encode player %r." % player.get_playername())
+            names.append(bytes((len(name),)) + name)
+            colors = (colors << 2) | _MARBLE_CODES[player.get_color()]
+
+        turn = _NONE if self._turn is None else self._turn
+        winner = _NONE if self._winner is None else self._player_slots[self._winner]
+        prev_1 = _NONE if self._player_1_prev_player_state is None else self._player_1_prev_player_state
+        prev_2 = _NONE if self._player_2_prev_player_state is None else self._player_2_prev_player_state
+        import struct
+        header = struct.pack(_HEADER_FORMAT, _FORMAT_VERSION, turn, winner, colors, self._player_1.get_captured_marbles(),
+                              self._player_2.get_captured_marbles(), prev_1, prev_2, self._move_count,
+                              self._board.to_bytes(), _pack_spaces(self._player_1_prev_board_state),
+                              _pack_spaces(self._player_2_prev_board_state))
+        return header + names[0] + names[1]
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Restores a game encoded by to_bytes. The debug flag is not encoded, so the restored game does not cross-check
+        its marble counts.
+        :param data: Bytes-like object.
+        :return: KubaGame object.
+        """
+        import struct
+        (version, turn, winner, colors, captured_1, captured_2, prev_1, prev_2, move_count, board, board_1,
+         board_2) = struct.unpack_from(_HEADER_FORMAT, data)
+        if version != _FORMAT_VERSION:
+            raise ValueError("Unsupported game encoding version %d." % version)
+
+        offset = struct.calcsize(_HEADER_FORMAT)
+        names = []
+        for num in range(2):
+            length = data[offset]
+            names.append(bytes(data[offset + 1:offset + 1 + length]).decode('utf-8'))
+            offset += 1 + length
+
+        game = cls((names[0], _CODE_MARBLES[colors >> 2]), (names[1], _CODE_MARBLES[colors & 3]))
+        game.set_position((_unpack_spaces(board), captured_1, captured_2,
+                           None if turn == _NONE else turn,
+                           None if winner == _NONE else names[winner],
+                           move_count,
+                           None if prev_1 == _NONE else _unpack_spaces(board_1),
+                           None if prev_1 == _NONE else prev_1,
+                           None if prev_2 == _NONE else _unpack_spaces(board_2),
+                           None if prev_2 == _NONE else prev_2))
+        return game
+
+    def to_text(self):
+        """
+        Encodes the whole game, including the state kept for the Ko rule, as readable JSON. Boards are written as 49
+        characters in row order with '.' for an empty space.
+        :return: String. Pass it to KubaGame.from_text to restore the game.
+        """
+        import json
+
+        def board_text(spaces):
+            return ''.join(marble or '.' for row in spaces for marble in row)
+
+        previous = []
+        for board, captured in ((self._player_1_prev_board_state, self._player_1_prev_player_state),
+                                (self._player_2_prev_board_state, self._player_2_prev_player_state)):
+            previous.append(None if board is None else [board_text(board), captured])
+
+        return json.dumps({'players': [[player.get_playername(), player.get_color(), player.get_captured_marbles()]
+                                       for player in self._players],
+                           'turn': self._turn,
+                           'winner': self._winner,
+                           'moves': self._move_count,
+                           'board': board_text(self._board.get_state()),
+                           'previous': previous})
+
+    @classmethod
+    def from_text(cls, text):
+        """
+        Restores a game encoded by to_text. The debug flag is not encoded, so the restored game does not cross-check its
+        marble counts.
+        :param text: String.
+        :return: KubaGame object.
+        """
+        import json
+
+        def text_board(characters):
+            cells = [None if marble == '.' else marble for marble in characters]
+            return [cells[index:index + 7] for index in range(0, 49, 7)]
+
+        state = json.loads(text)
+        (name_1, color_1, captured_1), (name_2, color_2, captured_2) = state['players']
+        previous = [(None, None) if entry is None else (text_board(entry[0]), entry[1]) for entry in state['previous']]
+        game = cls((name_1, color_1), (name_2, color_2))
+        game.set_position((text_board(state['board']), captured_1, captured_2, state['turn'], state['winner'],
+                           state['moves'], previous[0][0], previous[0][1], previous[1][0], previous[1][1]))
+        return game
+
+    def copy(self):
+        """
+        Returns an independent game with the same players and position. Listeners are not copied.
+        :return: KubaGame object.
+        """
+        game = KubaGame((self._player_1.get_playername(), self._player_1.get_color()),
+                        (self._player_2.get_playername(), self._player_2.get_color()), self._debug)
+        game.set_position(self.get_position())
+        return game
+
     def make_move(self, playername, coordinates, direction):
         """
         Given a player, a coordinate on the board, and a direction, attempts to push the marble in that direction. Checks
@@ -100,17 +449,20 @@ class KubaGame:
             # coordinates provided are not valid or a marble in the coordinates cannot be moved in the direction
             # specified or it is not the player's marble or for any other invalid conditions return False.
 
+        # Match playername to its slot. Name not recognized.
+        slot = self._player_slots.get(playername)
+        if slot is None:
+            return False
+
         # Not player's turn.
-        if self.get_current_turn() is not None and playername != self.get_current_turn():
+        if self._turn is not None and slot != self._turn:
             return False
 
-        # Match playername to _player_1 or _player_2. Defaults to None if name not recognized.
-        player = self._player_1 if self._player_1.get_playername() == playername else self._player_2 \
-            if self._player_2.get_playername() == playername else None
+        player = self._players[slot]
 
         # Check that the move is valid and update the board state if it is.
         if self._board.validate_move(coordinates, direction, player):
-            self._board.move_marble(coordinates, direction, player)
+            line, captured = self._board.move_marble(coordinates, direction, player)
         else:
             return False
 
@@ -124,40 +476,50 @@ class KubaGame:
             return False
 
         # Move finalized, update the state of board at the end of my turn to use for Ko Check during my next turn.
-        self._update_state(player)
+        self._update_state(slot)
 
         # Swap players.
-        self._update_turn(playername)
+        self._update_turn(slot)
 
         # Check for win conditions and update appropriately.
-        # has_won() uses _get_current_player as the turn has already been updated and we need a reference to both player
-        # objects in order to 1) check for the next player's possible valid moves and 2) update the winner to the current
-        # player's name if necessary.
-        if self._board.has_won(player, self._get_current_player()):
+        # has_won() uses the player in the updated turn slot as we need a reference to both player objects in order to
+        # 1) check for the next player's possible valid moves and 2) update the winner to the current player's name if
+        # necessary.
+        if self._board.has_won(player, self._players[self._turn]):
             self._winner = player.get_playername()
 
-        return True
+        self._move_count += 1
+        if self._listeners:
+            self._notify_listeners(playername, coordinates, direction, line, captured)
 
-    def _get_current_player(self):
-        """
-        Returns the player object for the current turn.
-        :return: Player object, the current player.
-        """
-        if self._turn == 0:
-            return self._player_1
-        elif self._turn == 1:
-            return self._player_2
+        return True
 
-    def _get_player_turn(self, player):
+    def _notify_listeners(self, playername, coordinates, direction, line, captured):
         """
-        Given a player object, matches the player to their turn.
-        :param player: Player object.
-        :return: Integer, the turn counter value for that player's turn.
+        Sends a description of the move just made to every registered listener. The move is already made, so a listener
+        that raises is logged and skipped rather than allowed to fail make_move or stop the listeners after it.
+        :param playername: String, the name of the player who moved.
+        :param coordinates: Tuple (Int, Int), the location of the pushed marble.
+        :param direction: String, the direction of the push.
+        :param line: List of Tuple (Int, Int), the spaces changed by the push.
+        :param captured: String, the marble pushed off the board, otherwise None.
+        :return: Nothing.
         """
-        if player == self._player_1:
-            return 0
-        elif player == self._player_2:
-            return 1
+        event = {'ply': self._move_count,
+                 'player': playername,
+                 'coordinates': coordinates,
+                 'direction': direction,
+                 'cells': [(location, self._board.return_marble(location)) for location in line],
+                 'captured': captured,
+                 'turn': self.get_current_turn(),
+                 'winner': self._winner}
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception:
+                # Imported here so games whose listeners never fail do not load logging.
+                import logging
+                logging.getLogger(__name__).exception("Listener %r failed on move %d.", listener, self._move_count)
 
     def _get_prev_board_state(self):
         """
@@ -195,39 +557,28 @@ class KubaGame:
         else:
             return None
 
-    def _update_state(self, player):
+    def _update_state(self, slot):
         """
         Updates the state of the current player's previous game states as they exist at the end of their current turn.
+        :param slot: Integer, the slot of the player who just moved.
         :return: Nothing.
         """
-        if self._get_player_turn(player) == 0:
-        # if self._turn == 0:
+        if slot == 0:
             self._player_1_prev_board_state = self._board.get_state()
             self._player_1_prev_player_state = self._player_1.get_captured_marbles()
-        elif self._get_player_turn(player) == 1:
-        # elif self._turn == 1:
+        else:
             self._player_2_prev_board_state = self._board.get_state()
             self._player_2_prev_player_state = self._player_2.get_captured_marbles()
 
-    def _update_turn(self, player):
+    def _update_turn(self, slot):
         """
-        Updates the turn counter to track whose turn it is. If no one has gone yet, sets _turn to the current player and
-        continues with the normal update procedure.
-        :param player: String, the name of a player.
-        :return: Nothing, otherwise returns False if invalid update made.
+        Updates the turn counter to track whose turn it is. The turn passes to the other slot, which also covers the
+        first move of the game when no one has gone yet.
+        :param slot: Integer, the slot of the player who just moved.
+        :return: Nothing.
         """
         # _player_1 is always _turn = 0 and _player_2 is always _turn = 1, regardless of who actually goes first.
-        if self._turn is None:
-            if player == self._player_1.get_playername():
-                self._turn = 0
-            elif player == self._player_2.get_playername():
-                self._turn = 1
-            # Invalid player, don't update turn
-            else:
-                return False
-
-        # Set _turn to 0 for player 1 or 1 for player 2
-        self._turn = (self._turn + 1) % 2
+        self._turn = 1 - slot
 
 
 class KubaBoard:
@@ -236,18 +587,17 @@ class KubaBoard:
     and moves marbles. Communicates with the KubaGame to send it information about the state of the board and whether
     moves are valid, and with the KubaPlayers to check their name and color.
     """
-    def __init__(self):
+    # Directions a marble can be pushed in.
+    DIRECTIONS = ('L', 'R', 'F', 'B')
+    # Map directions to the coordinate vectors of a push, shared by every board.
+    _moves = {'L': (0, -1), 'R': (0, 1), 'F': (-1, 0), 'B': (1, 0)}
+
+    def __init__(self, debug=False):
         """
         Initializes a new Kuba board.
+        :param debug: Boolean, cross-check the marble counts against a full scan whenever they are read.
         """
-        self._spaces = [[None] * 7 for num in range(7)]
-        # Coordinate vectors representing the direction of a given push:
-        self._left = (0,-1)
-        self._right = (0,1)
-        self._forward = (-1,0)
-        self._backward = (1,0)
-        # Map directions to vectors:
-        self._moves = {'L': self._left, 'R': self._right, 'F': self._forward, 'B': self._backward}
+        self._debug = debug
         self.initialize_marbles()
 
     def get_state(self):
@@ -264,6 +614,7 @@ class KubaBoard:
         :return: Nothing.
         """
         self._spaces = [row[:] for row in state]
+        self._marble_counts = self._count_marbles()
 
     def initialize_marbles(self):
         """
@@ -278,15 +629,9 @@ class KubaBoard:
         |	B	B	X	X	X	W	W	|
         ---------------------------------
         """
-        # Starting marble locations.
-        starting_marbles = {'W': [(0,0),(0,1),(1,0),(1,1),(5,5),(5,6),(6,5),(6,6)],
-                            'B': [(0,5),(0,6),(1,5),(1,6),(5,0),(5,1),(6,0),(6,1)],
-                            'R': [(1,3),(2,2),(2,3),(2,4),(3,1),(3,2),(3,3),(3,4),(3,5),(4,2),(4,3),(4,4),(5,3)]}
-
-        # Set each location on the board to its appropriate marble color.
-        for marble in starting_marbles.keys():
-            for location in starting_marbles[marble]:
-                self._spaces[location[0]][location[1]] = marble
+        # Copy the prebuilt starting position rather than placing each marble.
+        self._spaces = [list(row) for row in _STARTING_SPACES]
+        self._marble_counts = dict(_STARTING_COUNTS)
 
     def display_board(self):
         """
@@ -319,6 +664,10 @@ class KubaBoard:
         if not self.is_on_board(coordinates):
             return False
 
+        # Direction is not one of 'L', 'R', 'F', 'B'.
+        if direction not in self._moves:
+            return False
+
         # Location points to an empty spot on the board.
         if self._spaces[coordinates[0]][coordinates[1]] is None:
             return False
@@ -395,7 +744,8 @@ class KubaBoard:
         :param coordinates: Tuple (Int, Int), a location of a marble.
         :param direction: String, the direction to push the marble. 'L' = Left, 'R' = Right, 'F' = Forward, 'B' = Backward.
         :param player: Player object, the player making the move.
-        :return: Nothing.
+        :return: Tuple (List of Tuple (Int, Int), String), the spaces changed by the push and the marble pushed off the
+            board, otherwise None if no marble fell off.
         """
         # TODO: Determine some way to calculate this once and share between validate and move functions
         # Match the direction of the push to its momentum vector.
@@ -413,12 +763,17 @@ class KubaBoard:
         prev_spot = (end_coords[0]-momentum[0], end_coords[1]-momentum[1])
 
         # Capture any marbles that have fallen off.
+        fallen = None
         if not self.is_on_board(end_coords):
-            player.add_captured_marble(self._spaces[prev_spot[0]][prev_spot[1]])
+            fallen = self._spaces[prev_spot[0]][prev_spot[1]]
+            player.add_captured_marble(fallen)
+            self._marble_counts[fallen] -= 1
             end_coords = prev_spot
 
         # Go down the line from the end position to the start and move the marble locations.
+        line = []
         while end_coords != coordinates:
+            line.append(end_coords)
             next_spot = (end_coords[0]-momentum[0], end_coords[1]-momentum[1])
             self._spaces[end_coords[0]][end_coords[1]] = self._spaces[next_spot[0]][next_spot[1]]
             end_coords = next_spot
@@ -426,6 +781,28 @@ class KubaBoard:
         # Set the starting location to empty.
         self._spaces[coordinates[0]][coordinates[1]] = None
 
+        # Report the changed spaces in the order of the push.
+        line.append(coordinates)
+        line.reverse()
+
+        return line, fallen
+
+    def to_bytes(self):
+        """
+        Returns the board packed into 13 bytes, 2 bits per space in row order.
+        :return: Bytes.
+        """
+        return _pack_spaces(self._spaces)
+
+    def get_locations(self, marble):
+        """
+        Returns the locations of every marble of one color.
+        :param marble: String, the marble color.
+        :return: List of Tuple (Int, Int).
+        """
+        return [(row_index, column_index) for row_index, row in enumerate(self._spaces)
+                for column_index, column in enumerate(row) if column == marble]
+
     def return_marble(self, location):
         """
         Returns the marble at a given location.
@@ -450,9 +827,10 @@ class KubaBoard:
 
         # Determine whether the next player has any valid moves by checking every space on the board for their marbles.
         # For each marble found, check whether there are any valid ways to push the marble. If any exist, the game continues.
+        color = next_player.get_color()
         for row_index, row in enumerate(self._spaces):
             for column_index, column in enumerate(row):
-                if column == next_player.get_color():
+                if column == color:
                     for direction in self._moves.keys():
                         if self.validate_move((row_index, column_index), direction, next_player):
                             return False
@@ -470,9 +848,20 @@ class KubaBoard:
 
     def get_marbles(self):
         """
-        Returns a tuple of the count of each marble left on the game board.
+        Returns a tuple of the count of each marble left on the game board. In debug mode, the stored counts are checked
+        against a full scan of the board.
         :return: Tuple (Int, Int, Int), the count of (W, B, R) marbles left on the board in that order.
         """
+        counts = self._marble_counts
+        if self._debug and counts != self._count_marbles():
+            raise RuntimeError("Marble counts %s do not match the board %s." % (counts, self._count_marbles()))
+        return counts['W'], counts['B'], counts['R']
+
+    def _count_marbles(self):
+        """
+        Counts each color of marble on the board by scanning every space.
+        :return: Dictionary of String to Integer, the count of each of 'W', 'B' and 'R'.
+        """
         W, B, R, = 0, 0, 0
         for row in self._spaces:
             for column in row:
@@ -484,7 +873,7 @@ class KubaBoard:
                     elif column == 'R':
                         R += 1
 
-        return W, B, R
+        return {'W': W, 'B': B, 'R': R}
 
 
 class KubaPlayer:
@@ -541,7 +930,126 @@ class KubaPlayer:
             self._captured_marbles += 1
 
 
+def parse_coordinates(row, column):
+    """
+    Converts a row and column given as text into a coordinate tuple.
+    :param row: String, the row coordinate.
+    :param column: String, the column coordinate.
+    :return: Tuple (Int, Int), otherwise None if either value is not an integer.
+    """
+    try:
+        return int(row), int(column)
+    except ValueError:
+        return None
+
+
+def _format_moves(moves):
+    """
+    Formats moves the way the batch 'move' command takes them, for example 'PlayerA 6 5 F'. Any extra values, such as
+    the marble a threat would push off, follow the direction.
+    :param moves: List of Tuple (String, Tuple (Int, Int), String, ...).
+    :return: String, the moves separated by commas, otherwise 'None' if there are none.
+    """
+    if not moves:
+        return "None"
+    return ", ".join(" ".join([move[0], str(move[1][0]), str(move[1][1])] + list(move[2:])) for move in moves)
+
+
+def run_batch(lines, out=None, flush_every=4096):
+    """
+    Runs a scripted session without prompting. Each line holds one command and its parameters separated by whitespace,
+    for example 'new PlayerA PlayerB', 'move PlayerA 6 5 F', 'captured PlayerA', 'marble 6 5' or 'count'. 'hint' runs
+    a shallow search for the player to move and 'threats' lists the opponent's moves that would push a marble off. A
+    'new' line starts a fresh game, so many recorded sessions can be fed through a single stream. Blank lines and lines
+    starting with '#' are ignored. Malformed lines print 'Invalid command.' and processing continues with the next line.
+    :param lines: Iterable of Strings, the commands to run.
+    :param out: File-like object to write responses to. Defaults to sys.stdout.
+    :param flush_every: Integer, the number of responses to buffer before writing them out.
+    :return: Integer, the number of lines that could not be processed.
+    """
+    if out is None:
+        out = sys.stdout
+
+    game = None
+    names = ()
+    errors = 0
+    buffer = []
+    write = buffer.append
+
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0][0] == '#':
+            continue
+        command = parts[0]
+        count = len(parts)
+
+        if command == "new" and count == 3:
+            names = (parts[1], parts[2])
+            game = KubaGame((parts[1], 'W'), (parts[2], 'B'))
+        elif game is None:
+            write("Invalid command.")
+            errors += 1
+        elif command == "move" and count == 5:
+            coordinates = parse_coordinates(parts[2], parts[3])
+            if parts[1] not in names or coordinates is None:
+                write("Invalid move.")
+                errors += 1
+            elif game.make_move(parts[1], coordinates, parts[4]):
+                write("Move recorded.")
+                if game.get_winner() is not None:
+                    write(game.get_winner() + " has won!")
+            else:
+                write("Invalid move.")
+        elif command == "turn" and count == 1:
+            write(str(game.get_current_turn()))
+        elif command == "winner" and count == 1:
+            write(str(game.get_winner()))
+        elif command == "captured" and count == 2:
+            write(str(game.get_captured(parts[1])))
+        elif command == "marble" and count == 3:
+            coordinates = parse_coordinates(parts[1], parts[2])
+            if coordinates is None:
+                write("Invalid command.")
+                errors += 1
+            else:
+                write(str(game.get_marble(coordinates)))
+        elif command == "count" and count == 1:
+            write(str(game.get_marble_count()))
+        elif command == "hint" and count == 1:
+            from KubaSearch import best_move
+            move = best_move(game, 2)[1]
+            write(_format_moves([move] if move is not None else []))
+        elif command == "threats" and count == 1:
+            from KubaAnalysis import find_threats
+            write(_format_moves(find_threats(game)))
+        elif command == "q" and count == 1:
+            write("Goodbye!")
+            game = None
+        else:
+            write("Invalid command.")
+            errors += 1
+
+        # Write responses out in large blocks rather than line by line.
+        if len(buffer) >= flush_every:
+            out.write("\n".join(buffer) + "\n")
+            buffer.clear()
+
+    if buffer:
+        out.write("\n".join(buffer) + "\n")
+    out.flush()
+    return errors
+
+
 def main():
+    # Non-interactive mode: 'python KubaGame.py --batch [file]' reads commands from the file, or stdin if omitted.
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        if len(sys.argv) > 2 and sys.argv[2] != "-":
+            with open(sys.argv[2]) as script:
+                errors = run_batch(script)
+        else:
+            errors = run_batch(sys.stdin)
+        return 1 if errors else 0
+
     print("Welcome to Kuba! The goal of this classic marble game is for two players to take turns trying to knock "
           "marbles off the game board.")
     print("To begin, please provide the names of each player.")
@@ -553,9 +1061,12 @@ def main():
     print("\tcaptured (playername)")
     print("\tmarble (coordinates)")
     print("\tcount")
+    print("\thint")
+    print("\tthreats")
     name_one = input("Please provide the first player's name: ")
     name_two = input("Please provide the second player's name: ")
     game = KubaGame((name_one, 'W'), (name_two, 'B'))
+    analyzer = None
     command = None
     while command != 'q' and game.get_winner() is None:
         command = input("Next command: ")
@@ -564,9 +1075,12 @@ def main():
             if name != name_one and name != name_two:
                 print("Invalid name.")
                 continue
-            row_coord = int(input("Enter row coordinate: "))
-            col_coord = int(input("Enter column coordinate: "))
-            coordinates = (row_coord, col_coord)
+            row_coord = input("Enter row coordinate: ")
+            col_coord = input("Enter column coordinate: ")
+            coordinates = parse_coordinates(row_coord, col_coord)
+            if coordinates is None:
+                print("Invalid coordinates.")
+                continue
             direction = input("Enter direction as L, R, B, F: ")
             result = game.make_move(name, coordinates, direction)
             if result:
@@ -581,21 +1095,36 @@ def main():
             name = input("Enter playername: ")
             print(game.get_captured(name))
         elif command == "marble":
-            row_coord = int(input("Enter row coordinate: "))
-            col_coord = int(input("Enter column coordinate: "))
-            coordinates = (row_coord, col_coord)
+            row_coord = input("Enter row coordinate: ")
+            col_coord = input("Enter column coordinate: ")
+            coordinates = parse_coordinates(row_coord, col_coord)
+            if coordinates is None:
+                print("Invalid coordinates.")
+                continue
             print(game.get_marble(coordinates))
         elif command == "count":
             print(game.get_marble_count())
+        elif command == "hint" or command == "threats":
+            # Analysis starts the first time it is asked for and then follows the game in the background.
+            if analyzer is None:
+                analyzer = game.start_analysis()
+            if command == "hint":
+                hint = analyzer.get_hint(wait=1)
+                print(_format_moves([hint] if hint is not None else []))
+            else:
+                print(_format_moves(analyzer.get_threats(wait=1)))
         elif command == 'q':
             print("Goodbye!")
         else:
             print("Invalid command.")
 
+    if analyzer is not None:
+        analyzer.stop()
+
     if game.get_winner():
         print(game.get_winner(), "has won!")
 
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -2,8 +2,9 @@
 # Date: 2021-05-20
 # Description: Unit tests for Kuba Game.
 
+import io
 import unittest
-from KubaGame import KubaGame, KubaBoard
+from KubaGame import KubaGame, KubaBoard, run_batch, dump_games, load_games
 
 
 class TestGame(unittest.TestCase):
@@ -83,6 +84,50 @@ class TestGame(unittest.TestCase):
         self.assertEqual(result, True)
         self.assertEqual(self.game._turn, 0)
 
+    def test_unknown_player(self):
+        result = self.game.make_move('PlayerC', (6, 5), 'F')
+        self.assertEqual(result, False)
+        self.assertEqual(self.game.get_current_turn(), None)
+        self.assertEqual(self.game.get_captured('PlayerC'), None)
+
+    def test_player_accessors(self):
+        players = self.game.get_players()
+        self.assertEqual([player.get_playername() for player in players], ['PlayerA', 'PlayerB'])
+        self.assertEqual(self.game.get_player_slot('PlayerB'), 1)
+        self.assertEqual(self.game.get_player_slot('PlayerC'), None)
+        self.assertEqual(self.game.get_turn_slot(), None)
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.assertEqual(self.game.get_turn_slot(), 0)
+        self.assertEqual(self.game.get_board_state()[1][5], 'B')
+
+    def test_is_possible_move(self):
+        self.assertTrue(self.game.is_possible_move('PlayerA', (6, 5), 'F'))
+        self.assertFalse(self.game.is_possible_move('PlayerA', (5, 5), 'F'))
+        self.assertFalse(self.game.is_possible_move('PlayerC', (6, 5), 'F'))
+        # Ko is not applied: the move is possible but make_move refuses it.
+        for move in [('PlayerA', (6, 5), 'F'), ('PlayerB', (0, 5), 'B'), ('PlayerA', (5, 5), 'F')]:
+            self.game.make_move(*move)
+        self.assertFalse(self.game.make_move('PlayerB', (0, 5), 'B'))
+        self.assertTrue(self.game.is_possible_move('PlayerB', (0, 5), 'B'))
+        self.assertFalse(self.game.is_possible_move('PlayerA', (4, 5), 'F'))
+
+    def test_position_round_trip(self):
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        position = self.game.get_position()
+        copy = self.game.copy()
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.game.set_position(position)
+        self.assertEqual(self.game.get_position(), position)
+        self.assertEqual(copy.get_position(), position)
+        self.assertEqual(self.game.get_current_turn(), 'PlayerB')
+
+    def test_possible_moves(self):
+        self.assertEqual(len(self.game.get_possible_moves()), 16)
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        moves = self.game.get_possible_moves()
+        self.assertEqual(set(move[0] for move in moves), {'PlayerB'})
+        self.assertIn(('PlayerB', (0, 5), 'B'), moves)
+
     def test_blocked_push(self):
         result = self.game.make_move('PlayerA', (5, 5), 'F')
         self.assertEqual(result, False)
@@ -316,6 +361,36 @@ class TestBoard(unittest.TestCase):
                                      [None, None, 'R', 'R', 'R', None, None], ['B', 'B', None, 'R', None, 'W', 'W'],
                                      ['B', 'B', None, None, None, 'W', 'W']])
 
+    def test_boards_independent(self):
+        start = self.game._board.get_state()
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        board = KubaBoard()
+        self.assertEqual(board.get_state(), start)
+        self.assertEqual(board.get_marbles(), (8, 8, 13))
+
+    def test_marble_count_debug(self):
+        """
+        Check the stored counts against a full scan after captures and a Ko rollback.
+        """
+        game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'), debug=True)
+        # The fourth move is rolled back by the Ko rule, the last one pushes a Black marble off the board.
+        moves = [('PlayerA', (6, 5), 'F'), ('PlayerB', (0, 5), 'B'), ('PlayerA', (5, 5), 'F'),
+                 ('PlayerB', (0, 5), 'B'), ('PlayerB', (5, 0), 'R'), ('PlayerA', (4, 5), 'F')]
+        for move in moves:
+            game.make_move(*move)
+            game.get_marble_count()
+        self.assertEqual(game.get_marble_count(), (8, 7, 13))
+
+    def test_marble_count_debug_mismatch(self):
+        board = KubaBoard(debug=True)
+        board._marble_counts['R'] -= 1
+        self.assertRaises(RuntimeError, board.get_marbles)
+
+    def test_copy_keeps_debug(self):
+        game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'), debug=True).copy()
+        game._board._marble_counts['R'] -= 1
+        self.assertRaises(RuntimeError, game.get_marble_count)
+
 
 class TestPlayer(unittest.TestCase):
     def setUp(self):
@@ -373,5 +448,84 @@ class TestPlayer(unittest.TestCase):
         self.assertEqual(captured_two, 0)
 
 
+class TestBatch(unittest.TestCase):
+    def run_lines(self, lines):
+        out = io.StringIO()
+        errors = run_batch(lines, out)
+        return errors, out.getvalue().splitlines()
+
+    def test_batch_session(self):
+        errors, output = self.run_lines(["new PlayerA PlayerB", "move PlayerA 6 5 F", "turn", "marble 5 5", "count",
+                                         "captured PlayerA"])
+        self.assertEqual(errors, 0)
+        self.assertEqual(output, ["Move recorded.", "PlayerB", "W", "(8, 8, 13)", "0"])
+
+    def test_batch_malformed_lines(self):
+        errors, output = self.run_lines(["count", "new PlayerA PlayerB", "move PlayerA six 5 F", "marble 5",
+                                         "move PlayerA 6 5 Z", "", "# comment", "turn"])
+        self.assertEqual(errors, 3)
+        self.assertEqual(output, ["Invalid command.", "Invalid move.", "Invalid command.", "Invalid move.", "None"])
+
+    def test_batch_multiple_sessions(self):
+        errors, output = self.run_lines(["new PlayerA PlayerB", "move PlayerA 6 5 F", "q",
+                                         "new PlayerC PlayerD", "turn", "move PlayerA 6 5 F"])
+        self.assertEqual(errors, 1)
+        self.assertEqual(output, ["Move recorded.", "Goodbye!", "None", "Invalid move."])
+
+    def test_batch_hint_and_threats(self):
+        errors, output = self.run_lines(["new PlayerA PlayerB", "move PlayerA 6 5 F", "move PlayerB 0 5 B",
+                                         "move PlayerA 5 5 F", "move PlayerB 5 0 R", "hint",
+                                         "move PlayerA 4 5 F", "threats"])
+        self.assertEqual(errors, 0)
+        self.assertEqual(output[4:], ["PlayerA 4 5 F", "Move recorded.", "PlayerA 3 5 F B"])
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.game.make_move('PlayerA', (5, 5), 'F')
+
+    def test_new_game_round_trip(self):
+        game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        self.assertEqual(KubaGame.from_bytes(game.to_bytes()).get_position(), game.get_position())
+        self.assertEqual(KubaGame.from_text(game.to_text()).get_position(), game.get_position())
+
+    def test_bytes_round_trip(self):
+        data = self.game.to_bytes()
+        self.assertEqual(len(data), 51 + 8 + 8)
+        restored = KubaGame.from_bytes(data)
+        self.assertEqual(restored.get_position(), self.game.get_position())
+        self.assertEqual(restored.get_marble_count(), self.game.get_marble_count())
+
+    def test_text_round_trip(self):
+        restored = KubaGame.from_text(self.game.to_text())
+        self.assertEqual(restored.get_position(), self.game.get_position())
+
+    def test_ko_after_restore(self):
+        restored = KubaGame.from_bytes(self.game.to_bytes())
+        self.assertEqual(restored.make_move('PlayerB', (0, 5), 'B'), False)
+        self.assertEqual(restored.make_move('PlayerB', (5, 0), 'R'), True)
+
+    def test_winner_round_trip(self):
+        game = KubaGame(('PlayerA', 'B'), ('PlayerB', 'W'))
+        game.make_move('PlayerA', (0, 5), 'B')
+        game._winner = 'PlayerA'
+        restored = KubaGame.from_bytes(game.to_bytes())
+        self.assertEqual(restored.get_winner(), 'PlayerA')
+        self.assertEqual(restored._player_1.get_color(), 'B')
+
+    def test_unencodable_color(self):
+        game = KubaGame(('PlayerA', 'R'), ('PlayerB', 'B'))
+        self.assertRaises(ValueError, game.to_bytes)
+
+    def test_bulk_round_trip(self):
+        games = [self.game, KubaGame(('Alice', 'B'), ('Bob', 'W'))]
+        restored = load_games(dump_games(games))
+        self.assertEqual([game.get_position() for game in restored], [game.get_position() for game in games])
+        self.assertEqual(restored[1].get_captured('Bob'), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
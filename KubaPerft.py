@@ -0,0 +1,113 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Perft-style move generation counter and benchmark for Kuba.
+
+import sys
+import time
+from multiprocessing import Pool
+from KubaGame import KubaGame
+
+
+def perft(game, depth):
+    """
+    Counts the positions reachable from the game's current position in exactly depth moves. Moves are applied with
+    make_move, so the Ko rule and the end of the game are handled exactly as in play. Games that end early contribute no
+    leaf nodes. The game is returned to its starting position afterwards; use a game without listeners.
+    :param game: KubaGame object.
+    :param depth: Integer, the number of moves to look ahead.
+    :return: Integer, the number of leaf nodes.
+    """
+    if depth == 0:
+        return 1
+
+    nodes = 0
+    position = game.get_position()
+    for move in game.get_possible_moves():
+        if game.make_move(*move):
+            nodes += perft(game, depth - 1) if depth > 1 else 1
+            game.set_position(position)
+    return nodes
+
+
+def divide(game, depth, processes=1):
+    """
+    Breaks the perft count down by the first move. With more than one process, the first moves are split across a
+    pool of worker processes.
+    :param game: KubaGame object.
+    :param depth: Integer, the number of moves to look ahead. Must be at least 1.
+    :param processes: Integer, the number of worker processes to use. None uses one per core.
+    :return: Dictionary of move to Integer, the leaf nodes below each legal first move.
+    """
+    position = game.get_position()
+    roots = []
+    for move in game.get_possible_moves():
+        if game.make_move(*move):
+            roots.append(move)
+            game.set_position(position)
+
+    players = tuple((player.get_playername(), player.get_color()) for player in game.get_players())
+    tasks = [(players, position, move, depth) for move in roots]
+    if processes == 1:
+        counts = list(map(_divide_task, tasks))
+    else:
+        with Pool(processes) as pool:
+            counts = pool.map(_divide_task, tasks)
+    return dict(zip(roots, counts))
+
+
+def _divide_task(task):
+    """
+    Counts the leaf nodes below a single first move. Runs in a worker process for divide.
+    :param task: Tuple (players, position, move, depth).
+    :return: Integer, the number of leaf nodes.
+    """
+    players, position, move, depth = task
+    game = KubaGame(*players)
+    game.set_position(position)
+    game.make_move(*move)
+    return perft(game, depth - 1)
+
+
+def benchmark(game, depth, processes=1):
+    """
+    Runs perft and measures its speed.
+    :param game: KubaGame object.
+    :param depth: Integer, the number of moves to look ahead.
+    :param processes: Integer, the number of worker processes to split the first moves over.
+    :return: Tuple (Int, Float, Float), the leaf nodes, elapsed seconds and nodes per second.
+    """
+    start = time.perf_counter()
+    if processes == 1 or depth == 0:
+        nodes = perft(game, depth)
+    else:
+        nodes = sum(divide(game, depth, processes).values())
+    elapsed = time.perf_counter() - start
+    return nodes, elapsed, nodes / elapsed if elapsed else 0.0
+
+
+def main():
+    # Usage: python KubaPerft.py depth [--divide] [--processes=N]
+    args = sys.argv[1:]
+    depth = int(args[0]) if args else 3
+    processes = 1
+    for arg in args[1:]:
+        if arg.startswith("--processes="):
+            processes = int(arg.split("=")[1]) or None
+
+    game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+    if "--divide" in args and depth > 0:
+        start = time.perf_counter()
+        counts = divide(game, depth, processes)
+        elapsed = time.perf_counter() - start
+        for (playername, coordinates, direction), count in counts.items():
+            print(playername, coordinates[0], coordinates[1], direction, count)
+        nodes = sum(counts.values())
+    else:
+        nodes, elapsed, rate = benchmark(game, depth, processes)
+
+    print("Depth", depth, "nodes", nodes)
+    print("%.3f seconds, %.0f nodes per second" % (elapsed, nodes / elapsed if elapsed else 0.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for the Kuba perft counter.
+
+import unittest
+from KubaGame import KubaGame
+from KubaPerft import perft, divide
+
+
+class TestPerft(unittest.TestCase):
+    def setUp(self):
+        self.game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+
+    def test_start_position(self):
+        self.assertEqual([perft(self.game, depth) for depth in range(4)], [1, 16, 128, 1280])
+
+    def test_position_restored(self):
+        before = self.game.get_position()
+        perft(self.game, 2)
+        self.assertEqual(self.game.get_position(), before)
+
+    def test_divide_matches_perft(self):
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        counts = divide(self.game, 3)
+        self.assertEqual(len(counts), perft(self.game, 1))
+        self.assertEqual(sum(counts.values()), perft(self.game, 3))
+
+    def test_ko_excluded(self):
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.game.make_move('PlayerA', (5, 5), 'F')
+        self.assertIn(('PlayerB', (0, 5), 'B'), self.game.get_possible_moves())
+        self.assertNotIn(('PlayerB', (0, 5), 'B'), divide(self.game, 1))
+        self.assertEqual(perft(self.game, 1), len(self.game.get_possible_moves()) - 1)
+
+    def test_parallel_divide(self):
+        self.assertEqual(divide(self.game, 2, processes=2), divide(self.game, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Elo ratings from finished Kuba games and a matchmaking queue indexed by rating band.
+
+import random
+import sys
+import time
+from collections import OrderedDict
+
+
+def game_result(game):
+    """
+    Summarizes a finished game for rating.
+    :param game: KubaGame object.
+    :return: Tuple (String, String, String, Int, Int, Int), both player names, the winner (None if unfinished), both
+        players' captured Red marbles and the number of moves made.
+    """
+    name_1, name_2 = (player.get_playername() for player in game.get_players())
+    return (name_1, name_2, game.get_winner(), game.get_captured(name_1), game.get_captured(name_2),
+            game.get_move_count())
+
+
+class KubaRatings:
+    """
+    Elo ratings for players of Kuba. The rating change for a game is scaled by the margin of victory in captured Red
+    marbles and reduced for very short games.
+    """
+    def __init__(self, initial=1500, k_factor=32, short_game=10):
+        """
+        Initializes an empty set of ratings.
+        :param initial: Integer, the rating of a player's first game.
+        :param k_factor: Integer, the largest rating change for an even game.
+        :param short_game: Integer, games with fewer moves than this count for proportionally less.
+        """
+        self._initial = initial
+        self._k_factor = k_factor
+        self._short_game = short_game
+        self._ratings = dict()
+        self._games = dict()
+
+    def get_rating(self, playername):
+        """
+        Returns a player's rating.
+        :param playername: String.
+        :return: Float, the player's rating, the initial rating if they have not played.
+        """
+        return self._ratings.get(playername, self._initial)
+
+    def get_games(self, playername):
+        """
+        Returns the number of rated games a player has finished.
+        :param playername: String.
+        :return: Integer.
+        """
+        return self._games.get(playername, 0)
+
+    def record(self, result):
+        """
+        Updates both players' ratings from one game. Games without a winner are ignored.
+        :param result: Tuple, as returned by game_result.
+        :return: True or False, was the game rated.
+        """
+        name_1, name_2, winner, captured_1, captured_2, moves = result
+        if winner is None:
+            return False
+
+        rating_1 = self._ratings.get(name_1, self._initial)
+        rating_2 = self._ratings.get(name_2, self._initial)
+        expected_1 = 1 / (1 + 10 ** ((rating_2 - rating_1) / 400))
+        score_1 = 1.0 if winner == name_1 else 0.0
+
+        # A larger capture margin earns up to half as much again; short games count less.
+        margin = 1 + abs(captured_1 - captured_2) / 14
+        length = min(1.0, moves / self._short_game) if self._short_game else 1.0
+        change = self._k_factor * margin * length * (score_1 - expected_1)
+
+        self._ratings[name_1] = rating_1 + change
+        self._ratings[name_2] = rating_2 - change
+        self._games[name_1] = self._games.get(name_1, 0) + 1
+        self._games[name_2] = self._games.get(name_2, 0) + 1
+        return True
+
+    def record_stream(self, results, batch_size=1024, on_batch=None):
+        """
+        Rates a stream of games in batches, so results can be consumed as they arrive without holding them in memory.
+        :param results: Iterable of KubaGame objects or game_result tuples.
+        :param batch_size: Integer, the number of games per batch.
+        :param on_batch: Callable taking the number of games rated in the batch, called after each batch.
+        :return: Integer, the number of games rated.
+        """
+        rated = 0
+        batch = []
+        for result in results:
+            batch.append(result if isinstance(result, tuple) else game_result(result))
+            if len(batch) >= batch_size:
+                rated += self._record_batch(batch, on_batch)
+                batch = []
+        if batch:
+            rated += self._record_batch(batch, on_batch)
+        return rated
+
+    def _record_batch(self, batch, on_batch):
+        """
+        Rates one batch of results.
+        :param batch: List of game_result tuples.
+        :param on_batch: Callable or None.
+        :return: Integer, the number of games rated.
+        """
+        rated = 0
+        for result in batch:
+            if self.record(result):
+                rated += 1
+        if on_batch is not None:
+            on_batch(rated)
+        return rated
+
+
+class KubaMatchmaker:
+    """
+    A queue of players waiting for a game. Players are indexed by rating band, so a match is found by looking only at
+    the player's own band and its neighbours, and players who have waited longest are paired first within a band.
+    """
+    def __init__(self, band_width=50, max_bands=4):
+        """
+        Initializes an empty queue.
+        :param band_width: Integer, the width of each rating band.
+        :param max_bands: Integer, how many bands away from a player's own band to look for an opponent.
+        """
+        self._band_width = band_width
+        self._max_bands = max_bands
+        self._bands = dict()
+        self._queued = dict()
+
+    def __len__(self):
+        """
+        Returns the number of players waiting.
+        :return: Integer.
+        """
+        return len(self._queued)
+
+    def enqueue(self, playername, rating):
+        """
+        Adds a player to the queue, or updates their rating if they are already waiting.
+        :param playername: String.
+        :param rating: Float, the player's rating.
+        :return: Nothing.
+        """
+        if playername in self._queued:
+            self.dequeue(playername)
+        band = int(rating // self._band_width)
+        self._queued[playername] = band
+        self._bands.setdefault(band, OrderedDict())[playername] = rating
+
+    def dequeue(self, playername):
+        """
+        Removes a player from the queue.
+        :param playername: String.
+        :return: True or False, was the player waiting.
+        """
+        band = self._queued.pop(playername, None)
+        if band is None:
+            return False
+        players = self._bands[band]
+        del players[playername]
+        if not players:
+            del self._bands[band]
+        return True
+
+    def find_match(self, playername):
+        """
+        Pairs a waiting player with the longest-waiting opponent in the nearest rating band and removes both from the
+        queue. Bands are searched outward from the player's own band.
+        :param playername: String, a waiting player.
+        :return: Tuple (String, String), the pair, otherwise None if no opponent is close enough.
+        """
+        band = self._queued.get(playername)
+        if band is None:
+            return None
+        for distance in range(self._max_bands + 1):
+            for candidate_band in ((band,) if distance == 0 else (band - distance, band + distance)):
+                players = self._bands.get(candidate_band)
+                if not players:
+                    continue
+                for opponent in players:
+                    if opponent != playername:
+                        self.dequeue(playername)
+                        self.dequeue(opponent)
+                        return playername, opponent
+        return None
+
+    def pair_all(self):
+        """
+        Pairs as many waiting players as possible, longest-waiting within each band first.
+        :return: List of Tuple (String, String), the pairs made.
+        """
+        pairs = []
+        for band in sorted(self._bands):
+            while band in self._bands:
+                playername = next(iter(self._bands[band]))
+                pair = self.find_match(playername)
+                if pair is None:
+                    break
+                pairs.append(pair)
+        return pairs
+
+
+def benchmark(players=200000, seed=0):
+    """
+    Measures queue insertion and pairing throughput.
+    :param players: Integer, the number of players to queue.
+    :param seed: Integer, the seed for the random ratings.
+    :return: Tuple (Float, Float, Int), insertions per second, pairings per second and the number of pairs made.
+    """
+    rng = random.Random(seed)
+    ratings = [("Player%d" % number, rng.gauss(1500, 300)) for number in range(players)]
+    queue = KubaMatchmaker()
+
+    start = time.perf_counter()
+    for playername, rating in ratings:
+        queue.enqueue(playername, rating)
+    inserted = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = 0
+    for playername, rating in ratings:
+        if queue.find_match(playername) is not None:
+            pairs += 1
+    paired = time.perf_counter() - start
+    return players / inserted, pairs / paired if paired else 0.0, pairs
+
+
+def main():
+    # Usage: python KubaRating.py [players]
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    insert_rate, pair_rate, pairs = benchmark(players)
+    print("Queued %d players at %.0f insertions per second." % (players, insert_rate))
+    print("Made %d pairs at %.0f pairings per second (%.2f microseconds each)." %
+          (pairs, pair_rate, 1e6 / pair_rate if pair_rate else 0.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for Kuba ratings and matchmaking.
+
+import unittest
+from KubaGame import KubaGame
+from KubaRating import KubaRatings, KubaMatchmaker, game_result
+
+
+class TestRatings(unittest.TestCase):
+    def setUp(self):
+        self.ratings = KubaRatings()
+
+    def test_unfinished_game_not_rated(self):
+        game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        game.make_move('PlayerA', (6, 5), 'F')
+        self.assertEqual(game_result(game), ('PlayerA', 'PlayerB', None, 0, 0, 1))
+        self.assertEqual(self.ratings.record(game_result(game)), False)
+        self.assertEqual(self.ratings.get_rating('PlayerA'), 1500)
+
+    def test_winner_gains(self):
+        self.ratings.record(('PlayerA', 'PlayerB', 'PlayerA', 7, 0, 30))
+        self.assertEqual(self.ratings.get_rating('PlayerA'), 1524)
+        self.assertEqual(self.ratings.get_rating('PlayerB'), 1476)
+        self.assertEqual(self.ratings.get_games('PlayerB'), 1)
+
+    def test_short_game_counts_less(self):
+        self.ratings.record(('PlayerA', 'PlayerB', 'PlayerB', 0, 0, 5))
+        self.assertEqual(self.ratings.get_rating('PlayerB'), 1508)
+
+    def test_record_stream(self):
+        batches = []
+        results = [('PlayerA', 'PlayerB', 'PlayerA', 1, 0, 20)] * 5 + [('PlayerA', 'PlayerB', None, 0, 0, 3)]
+        rated = self.ratings.record_stream(iter(results), batch_size=2, on_batch=batches.append)
+        self.assertEqual(rated, 5)
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertGreater(self.ratings.get_rating('PlayerA'), 1550)
+
+
+class TestMatchmaker(unittest.TestCase):
+    def setUp(self):
+        self.queue = KubaMatchmaker(band_width=50, max_bands=2)
+
+    def test_pairs_within_band_first(self):
+        self.queue.enqueue('PlayerA', 1510)
+        self.queue.enqueue('PlayerB', 1620)
+        self.queue.enqueue('PlayerC', 1540)
+        self.assertEqual(self.queue.find_match('PlayerA'), ('PlayerA', 'PlayerC'))
+        self.assertEqual(len(self.queue), 1)
+
+    def test_nearby_band(self):
+        self.queue.enqueue('PlayerA', 1510)
+        self.queue.enqueue('PlayerB', 1590)
+        self.assertEqual(self.queue.find_match('PlayerB'), ('PlayerB', 'PlayerA'))
+
+    def test_too_far_apart(self):
+        self.queue.enqueue('PlayerA', 1500)
+        self.queue.enqueue('PlayerB', 1800)
+        self.assertEqual(self.queue.find_match('PlayerA'), None)
+        self.assertEqual(self.queue.pair_all(), [])
+        self.assertEqual(len(self.queue), 2)
+
+    def test_requeue_and_dequeue(self):
+        self.queue.enqueue('PlayerA', 1500)
+        self.queue.enqueue('PlayerA', 1900)
+        self.queue.enqueue('PlayerB', 1910)
+        self.assertEqual(self.queue.dequeue('PlayerC'), False)
+        self.assertEqual(self.queue.pair_all(), [('PlayerA', 'PlayerB')])
+        self.assertEqual(len(self.queue), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Fixed-depth alpha-beta search over Kuba positions with a pluggable transposition table.
+
+from KubaGame import KubaBoard
+
+WIN_SCORE = 100000
+# Transposition table bounds: the stored score is exact, a lower bound or an upper bound.
+EXACT, LOWER, UPPER = 0, 1, 2
+NO_MOVE = 0xFFFF
+
+
+class SearchCancelled(Exception):
+    """
+    Raised inside a search when its stop flag is set. The game being searched is left mid-search and should be thrown
+    away.
+    """
+
+
+def encode_move(coordinates, direction):
+    """
+    Encodes the location and direction of a push as a small integer. The player is implied by the position.
+    :param coordinates: Tuple (Int, Int).
+    :param direction: String, 'L', 'R', 'F' or 'B'.
+    :return: Integer between 0 and 195.
+    """
+    return (coordinates[0] * 7 + coordinates[1]) * 4 + KubaBoard.DIRECTIONS.index(direction)
+
+
+def decode_move(code):
+    """
+    Decodes a push encoded by encode_move.
+    :param code: Integer.
+    :return: Tuple (Tuple (Int, Int), String), the coordinates and direction.
+    """
+    location, direction = divmod(code, 4)
+    return divmod(location, 7), KubaBoard.DIRECTIONS[direction]
+
+
+class KubaLocalTable:
+    """
+    A transposition table private to one process. Shares the probe and store interface of KubaSharedTable.
+    """
+    def __init__(self):
+        """
+        Initializes an empty table.
+        """
+        self._entries = dict()
+
+    def probe(self, key):
+        """
+        Looks up a position.
+        :param key: Bytes, a position key from KubaGame.get_position_key.
+        :return: Tuple (Int, Int, Int, Int), the score, depth, bound and encoded best move, otherwise None.
+        """
+        return self._entries.get(key)
+
+    def store(self, key, score, depth, flag, move=NO_MOVE):
+        """
+        Records the result of searching a position, keeping the deeper of two results for the same position.
+        :param key: Bytes, a position key.
+        :param score: Integer, the score from the point of view of the player to move.
+        :param depth: Integer, the depth searched.
+        :param flag: Integer, EXACT, LOWER or UPPER.
+        :param move: Integer, the best move as encoded by encode_move.
+        :return: Nothing.
+        """
+        entry = self._entries.get(key)
+        if entry is None or depth >= entry[1]:
+            self._entries[key] = (score, depth, flag, move)
+
+
+def evaluate(game):
+    """
+    Scores a position from the point of view of the player to move: captured Red marbles count most, followed by the
+    number of own marbles left on the board compared to the opponent's.
+    :param game: KubaGame object.
+    :return: Integer.
+    """
+    if game.get_current_turn() is None:
+        return 0
+    slot = game.get_turn_slot()
+    players = game.get_players()
+    white, black, red = game.get_marble_count()
+    counts = {'W': white, 'B': black}
+    me, opponent = players[slot], players[1 - slot]
+    return (100 * (me.get_captured_marbles() - opponent.get_captured_marbles()) +
+            30 * (counts.get(me.get_color(), 0) - counts.get(opponent.get_color(), 0)))
+
+
+def negamax(game, depth, alpha=-WIN_SCORE - 1, beta=WIN_SCORE + 1, table=None, stop=None):
+    """
+    Searches the game to a fixed depth with alpha-beta pruning. Moves are applied with make_move so the Ko rule holds,
+    and the game is returned to its starting position afterwards.
+    :param game: KubaGame object without listeners.
+    :param depth: Integer, the number of moves to look ahead.
+    :param alpha: Integer, the score the player to move is already assured of.
+    :param beta: Integer, the score the opponent is already assured of.
+    :param table: KubaLocalTable, KubaSharedTable or None, the transposition table to consult and fill.
+    :param stop: threading.Event or None. When set, the search raises SearchCancelled at the next position it visits.
+    :return: Tuple (Int, Tuple), the score from the point of view of the player to move and the best move found,
+        otherwise None for the move if there is none.
+    """
+    if stop is not None and stop.is_set():
+        raise SearchCancelled()
+
+    # The player who just moved has won.
+    if game.get_winner() is not None:
+        return -WIN_SCORE - depth, None
+    if depth == 0:
+        return evaluate(game), None
+
+    key = None
+    hint = NO_MOVE
+    original_alpha = alpha
+    if table is not None:
+        key = game.get_position_key()
+        entry = table.probe(key)
+        if entry is not None:
+            score, entry_depth, flag, hint = entry
+            if entry_depth >= depth:
+                if flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha):
+                    return score, _find_move(game, hint)
+
+    moves = game.get_possible_moves()
+    # Try the move the table remembers first.
+    if hint != NO_MOVE:
+        moves.sort(key=lambda move: encode_move(move[1], move[2]) != hint)
+
+    best_score, best_move = None, None
+    position = game.get_position()
+    for move in moves:
+        if not game.make_move(*move):
+            continue
+        score = -negamax(game, depth - 1, -beta, -alpha, table, stop)[0]
+        game.set_position(position)
+        if best_score is None or score > best_score:
+            best_score, best_move = score, move
+        if score > alpha:
+            alpha = score
+        if alpha >= beta:
+            break
+
+    # Every move was refused by the Ko rule.
+    if best_move is None:
+        return evaluate(game), None
+
+    if table is not None:
+        flag = UPPER if best_score <= original_alpha else LOWER if best_score >= beta else EXACT
+        table.store(key, best_score, depth, flag, encode_move(best_move[1], best_move[2]))
+    return best_score, best_move
+
+
+def _find_move(game, code):
+    """
+    Turns an encoded move from the table back into a move for the player to move.
+    :param game: KubaGame object.
+    :param code: Integer, a move from encode_move, or NO_MOVE.
+    :return: Tuple (String, Tuple (Int, Int), String), otherwise None.
+    """
+    if code == NO_MOVE or game.get_current_turn() is None:
+        return None
+    coordinates, direction = decode_move(code)
+    return game.get_current_turn(), coordinates, direction
+
+
+def best_move(game, depth, table=None):
+    """
+    Finds the best move for the player to move. The game itself is not changed.
+    :param game: KubaGame object.
+    :param depth: Integer, the number of moves to look ahead.
+    :param table: KubaLocalTable, KubaSharedTable or None.
+    :return: Tuple (Int, Tuple), the score and the best move, otherwise None if there are no legal moves.
+    """
+    return negamax(game.copy(), depth, table=table)
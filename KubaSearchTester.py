@@ -0,0 +1,83 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for the Kuba search and shared transposition table.
+
+import unittest
+from multiprocessing import Pool
+from KubaGame import KubaGame
+from KubaSearch import KubaLocalTable, best_move, encode_move, decode_move, EXACT, LOWER
+from KubaSharedTable import KubaSharedTable, parallel_search
+
+
+def probe_in_worker(task):
+    name, key = task
+    table = KubaSharedTable(name=name, create=False)
+    try:
+        return table.probe(key)
+    finally:
+        table.close()
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.game.make_move('PlayerA', (5, 5), 'F')
+        self.game.make_move('PlayerB', (5, 0), 'R')
+
+    def test_move_encoding(self):
+        self.assertEqual(decode_move(encode_move((4, 5), 'F')), ((4, 5), 'F'))
+        self.assertEqual(encode_move((6, 6), 'B'), 195)
+
+    def test_finds_capture(self):
+        self.assertEqual(best_move(self.game, 1), (30, ('PlayerA', (4, 5), 'F')))
+
+    def test_table_does_not_change_result(self):
+        self.assertEqual(best_move(self.game, 3, KubaLocalTable()), best_move(self.game, 3))
+
+    def test_game_unchanged(self):
+        position = self.game.get_position()
+        best_move(self.game, 2)
+        self.assertEqual(self.game.get_position(), position)
+
+
+class TestSharedTable(unittest.TestCase):
+    def setUp(self):
+        self.table = KubaSharedTable(1024)
+        self.key = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B')).get_position_key()
+
+    def tearDown(self):
+        self.table.close()
+        self.table.unlink()
+
+    def test_store_and_probe(self):
+        self.assertEqual(self.table.probe(self.key), None)
+        self.table.store(self.key, -25, 3, EXACT, 17)
+        self.assertEqual(self.table.probe(self.key), (-25, 3, EXACT, 17))
+        self.assertEqual(self.table.get_stats(), (1, 1))
+
+    def test_deeper_entry_kept(self):
+        self.table.store(self.key, 10, 5, EXACT, 1)
+        self.table.store(self.key, 20, 2, LOWER, 2)
+        self.assertEqual(self.table.probe(self.key), (10, 5, EXACT, 1))
+
+    def test_torn_entry_is_a_miss(self):
+        self.table.store(self.key, 10, 5, EXACT, 1)
+        offset = self.table._offset(self.key)
+        self.table._memory.buf[offset + 16] ^= 0xFF
+        self.assertEqual(self.table.probe(self.key), None)
+
+    def test_other_process_sees_entry(self):
+        self.table.store(self.key, 42, 4, EXACT, 9)
+        with Pool(1) as pool:
+            self.assertEqual(pool.map(probe_in_worker, [(self.table.get_name(), self.key)]), [(42, 4, EXACT, 9)])
+
+    def test_parallel_search(self):
+        game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        game.make_move('PlayerA', (6, 5), 'F')
+        self.assertEqual(parallel_search(game, 3, 2, shared=True), parallel_search(game, 3, 2, shared=False))
+
+
+if __name__ == "__main__":
+    unittest.main()
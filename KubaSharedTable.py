@@ -0,0 +1,182 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: A transposition table of packed Kuba positions in shared memory, for search workers in several processes.
+
+import struct
+import sys
+import time
+import zlib
+from multiprocessing import Pool, shared_memory
+from KubaGame import KubaGame
+from KubaSearch import KubaLocalTable, negamax, NO_MOVE
+
+# The table starts with a header holding a magic number and the number of entries.
+_MAGIC = 0x4B554241
+_HEADER = struct.Struct('<II')
+# Each entry holds a 16 byte check and 8 bytes of data: score, depth, bound and encoded best move.
+_ENTRY = struct.Struct('<16s8s')
+_DATA = struct.Struct('<iBBH')
+
+
+class KubaSharedTable:
+    """
+    A fixed-size transposition table in shared memory. Workers attach to it by name and read and write entries without
+    locks or copies between processes. Each entry stores its key XORed with its data, so a read that sees a half-written
+    entry from another process fails the check and is treated as a miss instead of returning a corrupt result.
+    """
+    def __init__(self, entries=1 << 16, name=None, create=True):
+        """
+        Creates a new table, or attaches to an existing one.
+        :param entries: Integer, the number of entries when creating a table.
+        :param name: String, the shared memory block name. Generated when creating a table if not given.
+        :param create: Boolean, create a new table rather than attach to the one called name.
+        """
+        if create:
+            self._memory = shared_memory.SharedMemory(name=name, create=True,
+                                                      size=_HEADER.size + entries * _ENTRY.size)
+            _HEADER.pack_into(self._memory.buf, 0, _MAGIC, entries)
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+            magic, entries = _HEADER.unpack_from(self._memory.buf, 0)
+            if magic != _MAGIC:
+                raise ValueError("Shared memory block %r is not a Kuba table." % name)
+        self._entries = entries
+        self._hits = 0
+        self._misses = 0
+
+    def get_name(self):
+        """
+        Returns the name other processes use to attach to the table.
+        :return: String.
+        """
+        return self._memory.name
+
+    def get_stats(self):
+        """
+        Returns how many probes from this process found an entry and how many did not.
+        :return: Tuple (Int, Int), the hits and misses.
+        """
+        return self._hits, self._misses
+
+    def _offset(self, key):
+        """
+        Returns where the entry for a key is stored.
+        :param key: Bytes, a position key.
+        :return: Integer, the offset into shared memory.
+        """
+        return _HEADER.size + (zlib.crc32(key) % self._entries) * _ENTRY.size
+
+    def probe(self, key):
+        """
+        Looks up a position.
+        :param key: Bytes, a 16 byte position key from KubaGame.get_position_key.
+        :return: Tuple (Int, Int, Int, Int), the score, depth, bound and encoded best move, otherwise None.
+        """
+        check, data = _ENTRY.unpack_from(self._memory.buf, self._offset(key))
+        if int.from_bytes(check, 'little') ^ int.from_bytes(data + data, 'little') != int.from_bytes(key, 'little'):
+            self._misses += 1
+            return None
+        self._hits += 1
+        return _DATA.unpack(data)
+
+    def store(self, key, score, depth, flag, move=NO_MOVE):
+        """
+        Records the result of searching a position. A shallower result never replaces a deeper one for the same
+        position; a different position always takes the slot.
+        :param key: Bytes, a 16 byte position key.
+        :param score: Integer, the score from the point of view of the player to move.
+        :param depth: Integer, the depth searched.
+        :param flag: Integer, EXACT, LOWER or UPPER.
+        :param move: Integer, the best move as encoded by KubaSearch.encode_move.
+        :return: Nothing.
+        """
+        offset = self._offset(key)
+        check, data = _ENTRY.unpack_from(self._memory.buf, offset)
+        key_value = int.from_bytes(key, 'little')
+        if int.from_bytes(check, 'little') ^ int.from_bytes(data + data, 'little') == key_value:
+            if _DATA.unpack(data)[1] > depth:
+                return
+        data = _DATA.pack(score, depth, flag, move)
+        check = (key_value ^ int.from_bytes(data + data, 'little')).to_bytes(16, 'little')
+        _ENTRY.pack_into(self._memory.buf, offset, check, data)
+
+    def close(self):
+        """
+        Detaches this process from the table.
+        :return: Nothing.
+        """
+        self._memory.close()
+
+    def unlink(self):
+        """
+        Frees the shared memory once every process has closed the table. Call from the process that created it.
+        :return: Nothing.
+        """
+        self._memory.unlink()
+
+
+def _search_task(task):
+    """
+    Searches one first move in a worker process, using the shared table if a name is given.
+    :param task: Tuple (data, move, depth, name), the encoded game, the first move, the depth and the table name.
+    :return: Tuple (Tuple, Int), the first move and its score.
+    """
+    data, move, depth, name = task
+    game = KubaGame.from_bytes(data)
+    game.make_move(*move)
+    if name is None:
+        table = KubaLocalTable()
+    else:
+        table = KubaSharedTable(name=name, create=False)
+    try:
+        return move, -negamax(game, depth - 1, table=table)[0]
+    finally:
+        if name is not None:
+            table.close()
+
+
+def parallel_search(game, depth, processes=None, shared=True, entries=1 << 18):
+    """
+    Scores every first move of a position in a pool of worker processes. With shared set, the workers share one table
+    so positions reached from different first moves are searched once.
+    :param game: KubaGame object.
+    :param depth: Integer, the depth to search, at least 1.
+    :param processes: Integer, the number of workers. Defaults to one per core.
+    :param shared: Boolean, share a KubaSharedTable between the workers rather than give each its own table.
+    :param entries: Integer, the size of the shared table.
+    :return: Dictionary of move to Integer, the score of each legal first move.
+    """
+    table = KubaSharedTable(entries) if shared else None
+    try:
+        data = game.to_bytes()
+        position = game.get_position()
+        moves = []
+        for move in game.get_possible_moves():
+            if game.make_move(*move):
+                moves.append(move)
+                game.set_position(position)
+        tasks = [(data, move, depth, table.get_name() if shared else None) for move in moves]
+        with Pool(processes) as pool:
+            return dict(pool.map(_search_task, tasks))
+    finally:
+        if shared:
+            table.close()
+            table.unlink()
+
+
+def main():
+    # Usage: python KubaSharedTable.py [depth] [processes]
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+    game.make_move('PlayerA', (6, 5), 'F')
+    for shared in (False, True):
+        start = time.perf_counter()
+        scores = parallel_search(game, depth, processes, shared)
+        elapsed = time.perf_counter() - start
+        print("Shared table" if shared else "Private tables", "%.3f seconds," % elapsed, "best score",
+              max(scores.values()))
+
+
+if __name__ == "__main__":
+    main()
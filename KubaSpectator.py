@@ -0,0 +1,134 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Broadcasts compact per-move board diffs from a game of Kuba to any number of spectators.
+
+import asyncio
+import json
+import logging
+
+
+def encode_diff(event):
+    """
+    Encodes a move event from KubaGame.add_listener into compact bytes. The changed spaces are packed into a single
+    string of (row, column, marble) triples, with '.' standing for an empty space.
+    :param event: Dictionary, a move event.
+    :return: Bytes, the encoded diff.
+    """
+    cells = "".join("%d%d%s" % (location[0], location[1], marble or '.') for location, marble in event['cells'])
+    coordinates = event['coordinates']
+    record = [event['ply'], event['player'], coordinates[0], coordinates[1], event['direction'], cells,
+              event['captured'], event['turn'], event['winner']]
+    return json.dumps(record, separators=(',', ':')).encode()
+
+
+def decode_diff(data):
+    """
+    Decodes bytes produced by encode_diff back into a move event.
+    :param data: Bytes, an encoded diff.
+    :return: Dictionary, the move event.
+    """
+    ply, player, row, column, direction, cells, captured, turn, winner = json.loads(data)
+    changed = []
+    for index in range(0, len(cells), 3):
+        marble = cells[index + 2]
+        changed.append(((int(cells[index]), int(cells[index + 1])), None if marble == '.' else marble))
+    return {'ply': ply,
+            'player': player,
+            'coordinates': (row, column),
+            'direction': direction,
+            'cells': changed,
+            'captured': captured,
+            'turn': turn,
+            'winner': winner}
+
+
+class KubaBroadcaster:
+    """
+    Publishes the moves of a single KubaGame to many spectators. Each move is encoded once and the same bytes are
+    delivered to every subscriber. A subscriber is any object with a deliver(data) method.
+    """
+    def __init__(self, game):
+        """
+        Initializes a broadcaster and starts listening to game.
+        :param game: KubaGame object, the game to broadcast.
+        """
+        self._game = game
+        self._subscribers = []
+        game.add_listener(self.publish)
+
+    def subscribe(self, subscriber):
+        """
+        Adds a subscriber to receive every following move.
+        :param subscriber: Object with a deliver(data) method.
+        :return: Nothing.
+        """
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber):
+        """
+        Stops delivering moves to a subscriber.
+        :param subscriber: Object previously passed to subscribe.
+        :return: Nothing.
+        """
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def get_subscriber_count(self):
+        """
+        Returns the number of subscribers currently receiving moves.
+        :return: Integer.
+        """
+        return len(self._subscribers)
+
+    def publish(self, event):
+        """
+        Encodes a move event and delivers it to every subscriber. A subscriber whose delivery raises, such as one whose
+        connection has closed, is logged and unsubscribed, and the rest still receive the move.
+        :param event: Dictionary, a move event from KubaGame.
+        :return: Bytes, the encoded diff that was delivered.
+        """
+        data = encode_diff(event)
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.deliver(data)
+            except Exception:
+                logging.getLogger(__name__).exception("Dropping subscriber %r after a failed delivery.", subscriber)
+                self.unsubscribe(subscriber)
+        return data
+
+    def close(self):
+        """
+        Stops listening to the game and drops all subscribers.
+        :return: Nothing.
+        """
+        self._game.remove_listener(self.publish)
+        self._subscribers = []
+
+
+class AsyncioSubscriber:
+    """
+    A local spectator that queues encoded diffs on an asyncio event loop. Delivery is safe to call from any thread, so
+    the game may be played outside the loop.
+    """
+    def __init__(self, loop=None):
+        """
+        Initializes a subscriber bound to an event loop.
+        :param loop: asyncio event loop to deliver to. Defaults to the running loop.
+        """
+        self._loop = loop if loop is not None else asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+    def deliver(self, data):
+        """
+        Queues an encoded diff for the subscriber.
+        :param data: Bytes, an encoded diff.
+        :return: Nothing.
+        """
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, data)
+
+    async def receive(self):
+        """
+        Waits for the next move and returns it decoded.
+        :return: Dictionary, the move event.
+        """
+        return decode_diff(await self._queue.get())
@@ -0,0 +1,120 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for the Kuba spectator broadcast.
+
+import asyncio
+import unittest
+from KubaGame import KubaGame
+from KubaSpectator import KubaBroadcaster, AsyncioSubscriber, encode_diff, decode_diff
+
+
+class RecordingSubscriber:
+    def __init__(self):
+        self.received = []
+
+    def deliver(self, data):
+        self.received.append(data)
+
+
+class TestBroadcast(unittest.TestCase):
+    def setUp(self):
+        self.game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        self.events = []
+        self.game.add_listener(self.events.append)
+
+    def test_move_event(self):
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.assertEqual(self.events, [{'ply': 1, 'player': 'PlayerA', 'coordinates': (6, 5), 'direction': 'F',
+                                        'cells': [((6, 5), None), ((5, 5), 'W'), ((4, 5), 'W')], 'captured': None,
+                                        'turn': 'PlayerB', 'winner': None}])
+
+    def test_no_event_for_invalid_or_ko_moves(self):
+        self.game.make_move('PlayerA', (5, 5), 'F')
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.game.make_move('PlayerA', (5, 5), 'F')
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.assertEqual([event['ply'] for event in self.events], [1, 2, 3])
+
+    def test_captured_marble(self):
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.game.make_move('PlayerA', (5, 5), 'F')
+        self.game.make_move('PlayerB', (5, 0), 'R')
+        self.game.make_move('PlayerA', (4, 5), 'F')
+        self.assertEqual(self.events[-1]['captured'], 'B')
+        self.assertEqual(self.events[-1]['cells'], [((4, 5), None), ((3, 5), 'W'), ((2, 5), 'W'), ((1, 5), 'R'),
+                                                    ((0, 5), 'B')])
+
+    def test_round_trip(self):
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.assertEqual(decode_diff(encode_diff(self.events[0])), self.events[0])
+
+    def test_fan_out_same_bytes(self):
+        broadcaster = KubaBroadcaster(self.game)
+        subscribers = [RecordingSubscriber() for num in range(3)]
+        for subscriber in subscribers:
+            broadcaster.subscribe(subscriber)
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        broadcaster.unsubscribe(subscribers[2])
+        self.game.make_move('PlayerB', (0, 5), 'B')
+        self.assertEqual(len(subscribers[0].received), 2)
+        self.assertIs(subscribers[0].received[0], subscribers[1].received[0])
+        self.assertEqual(len(subscribers[2].received), 1)
+        broadcaster.close()
+        self.game.make_move('PlayerA', (5, 5), 'F')
+        self.assertEqual(len(subscribers[0].received), 2)
+
+    def test_unsubscribe_during_delivery(self):
+        broadcaster = KubaBroadcaster(self.game)
+        later = RecordingSubscriber()
+        leaving = RecordingSubscriber()
+        leaving.deliver = lambda data: broadcaster.unsubscribe(leaving)
+        broadcaster.subscribe(leaving)
+        broadcaster.subscribe(later)
+        self.game.make_move('PlayerA', (6, 5), 'F')
+        self.assertEqual(len(later.received), 1)
+        self.assertEqual(broadcaster.get_subscriber_count(), 1)
+
+    def test_failing_subscriber_dropped(self):
+        broadcaster = KubaBroadcaster(self.game)
+        loop = asyncio.new_event_loop()
+        closed = AsyncioSubscriber(loop)
+        loop.close()
+        later = RecordingSubscriber()
+        broadcaster.subscribe(closed)
+        broadcaster.subscribe(later)
+        with self.assertLogs('KubaSpectator', 'ERROR'):
+            self.assertTrue(self.game.make_move('PlayerA', (6, 5), 'F'))
+        self.assertEqual(later.received, [encode_diff(self.events[0])])
+        self.assertEqual(broadcaster.get_subscriber_count(), 1)
+        self.assertEqual(self.game.get_current_turn(), 'PlayerB')
+
+    def test_failing_listener(self):
+        def fail(event):
+            raise RuntimeError("listener failed")
+
+        game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        events = []
+        game.add_listener(fail)
+        game.add_listener(events.append)
+        with self.assertLogs('KubaGame', 'ERROR'):
+            self.assertTrue(game.make_move('PlayerA', (6, 5), 'F'))
+        self.assertEqual(len(events), 1)
+        self.assertEqual(game.get_move_count(), 1)
+
+    def test_asyncio_subscriber(self):
+        async def watch():
+            broadcaster = KubaBroadcaster(self.game)
+            subscriber = AsyncioSubscriber()
+            broadcaster.subscribe(subscriber)
+            self.game.make_move('PlayerA', (6, 5), 'F')
+            self.game.make_move('PlayerB', (0, 5), 'B')
+            return [await subscriber.receive(), await subscriber.receive()]
+
+        received = asyncio.run(watch())
+        self.assertEqual(received, self.events)
+
+
+if __name__ == "__main__":
+    unittest.main()
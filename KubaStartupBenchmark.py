@@ -0,0 +1,54 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Measures how quickly the KubaGame module imports and how many new games can be constructed per second.
+
+import subprocess
+import sys
+import time
+
+_IMPORT_SCRIPT = "import time; start = time.perf_counter(); import KubaGame; print(time.perf_counter() - start)"
+
+
+def measure_import(runs=20):
+    """
+    Imports KubaGame in fresh interpreter processes and times the import alone, excluding interpreter startup.
+    :param runs: Integer, the number of processes to start.
+    :return: Tuple (Float, Float), the fastest and median import time in seconds.
+    """
+    times = []
+    for num in range(runs):
+        output = subprocess.run([sys.executable, "-c", _IMPORT_SCRIPT], capture_output=True, text=True, check=True)
+        times.append(float(output.stdout))
+    times.sort()
+    return times[0], times[len(times) // 2]
+
+
+def measure_construction(seconds=1.0):
+    """
+    Constructs new games for a fixed amount of time.
+    :param seconds: Float, how long to keep constructing games.
+    :return: Float, games constructed per second.
+    """
+    from KubaGame import KubaGame
+    players = (('PlayerA', 'W'), ('PlayerB', 'B'))
+    games = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for num in range(1000):
+            KubaGame(*players)
+        games += 1000
+    return games / (time.perf_counter() - start)
+
+
+def main():
+    # Usage: python KubaStartupBenchmark.py [import runs] [construction seconds]
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    fastest, median = measure_import(runs)
+    print("Import: %.3f ms fastest, %.3f ms median over %d processes." % (fastest * 1e3, median * 1e3, runs))
+    print("Construction: %.0f games per second." % measure_construction(seconds))
+
+
+if __name__ == "__main__":
+    main()
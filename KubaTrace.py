@@ -0,0 +1,209 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Opt-in span tracing of KubaGame and KubaBoard calls, exportable for trace viewers and flame graphs.
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+import weakref
+from KubaGame import KubaGame, KubaBoard
+
+# Only one tracer may instrument the classes at a time.
+_active = None
+# Guards the numbering of games seen by different threads.
+_lock = threading.Lock()
+
+
+class KubaTracer:
+    """
+    Records how long each KubaGame and KubaBoard method call takes. Tracing works by replacing the methods of both
+    classes with timed wrappers while the tracer is running and putting the originals back when it stops, so there is
+    no cost at all when tracing is off. The most recent spans are kept in a ring buffer of fixed size.
+
+    Because the classes themselves are patched, only one tracer can run in a process. Every span records the game it
+    belongs to: a KubaGame call belongs to its own game, and a KubaBoard call to the KubaGame call it was made from.
+    Pass games to record only some games, such as one slow match on a server hosting many, or filter the spans of a
+    whole-process trace by game id when reading or exporting them. Classmethods such as KubaGame.from_bytes are traced
+    too, but the game they build does not exist yet, so they belong to the game they were called from, if any.
+    """
+    def __init__(self, capacity=65536, classes=(KubaGame, KubaBoard), games=None):
+        """
+        Initializes a stopped tracer.
+        :param capacity: Integer, the number of spans to keep. Older spans are dropped first.
+        :param classes: Tuple of classes whose methods are traced.
+        :param games: Dictionary mapping the KubaGame objects to record to their game ids, such as match ids.
+            Otherwise None to record every game, numbering them from 1 in the order they are first seen.
+        """
+        self._spans = collections.deque(maxlen=capacity)
+        self._classes = classes
+        self._originals = []
+        self._local = threading.local()
+        self._selected = games is not None
+        self._game_ids = weakref.WeakKeyDictionary(games or {})
+        self._next_id = 1
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Starts tracing by wrapping every method of the traced classes.
+        :return: Nothing.
+        """
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another KubaTracer is already running.")
+        _active = self
+        for cls in self._classes:
+            is_game = issubclass(cls, KubaGame)
+            for name, function in list(vars(cls).items()):
+                if name.startswith('__'):
+                    continue
+                if isinstance(function, classmethod):
+                    wrapper = classmethod(self._wrap(cls.__name__ + '.' + name, function.__func__, False))
+                elif callable(function):
+                    wrapper = self._wrap(cls.__name__ + '.' + name, function, is_game)
+                else:
+                    continue
+                self._originals.append((cls, name, function))
+                setattr(cls, name, wrapper)
+
+    def stop(self):
+        """
+        Stops tracing and restores the original methods. Recorded spans are kept.
+        :return: Nothing.
+        """
+        global _active
+        for cls, name, function in self._originals:
+            setattr(cls, name, function)
+        self._originals = []
+        if _active is self:
+            _active = None
+
+    def clear(self):
+        """
+        Discards every recorded span.
+        :return: Nothing.
+        """
+        self._spans.clear()
+
+    def get_spans(self, game_id=None):
+        """
+        Returns the recorded spans, oldest first. A span is recorded when its call returns, so calls appear after the
+        calls they made.
+        :param game_id: The id of the game to return spans for, otherwise None for every span.
+        :return: List of Tuple (String, Int, Int, Int, Tuple, Object), each call as its name, thread id, start time and
+            duration in nanoseconds, the names of the traced calls it was made from, ending with itself, and the id of
+            its game, or None if it belongs to no game.
+        """
+        if game_id is None:
+            return list(self._spans)
+        return [span for span in self._spans if span[5] == game_id]
+
+    def get_game_id(self, game):
+        """
+        Returns the id spans of a game are recorded with.
+        :param game: KubaGame object.
+        :return: The id given for the game, or the number assigned to it, otherwise None if it has not been recorded.
+        """
+        return self._game_ids.get(game)
+
+    def _game_id(self, game):
+        """
+        Looks up the id of a game for a new span, numbering games not seen before unless only chosen games are traced.
+        :param game: KubaGame object, otherwise None.
+        :return: The game id, otherwise None if the game is not recorded.
+        """
+        if game is None:
+            return None
+        game_id = self._game_ids.get(game)
+        if game_id is None and not self._selected:
+            with _lock:
+                game_id = self._game_ids.setdefault(game, self._next_id)
+                if game_id == self._next_id:
+                    self._next_id += 1
+        return game_id
+
+    def _wrap(self, name, function, is_game):
+        """
+        Builds the timed replacement for one method.
+        :param name: String, the name recorded for the method.
+        :param function: The original method.
+        :param is_game: Boolean, the method belongs to KubaGame, so its first argument is the game.
+        :return: The wrapper.
+        """
+        spans = self._spans
+        local = self._local
+        selected = self._selected
+        game_id_of = self._game_id
+        clock = time.perf_counter_ns
+        get_ident = threading.get_ident
+
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            stack = getattr(local, 'stack', None)
+            if stack is None:
+                stack = local.stack = []
+                local.games = [None]
+            games = local.games
+            # Board calls belong to the game call they were made from.
+            game = args[0] if is_game else games[-1]
+            game_id = game_id_of(game)
+            if selected and game_id is None:
+                games.append(game)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    games.pop()
+            stack.append(name)
+            games.append(game)
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                spans.append((name, get_ident(), start, clock() - start, tuple(stack), game_id))
+                stack.pop()
+                games.pop()
+
+        return traced
+
+    def export_chrome_trace(self, file, game_id=None):
+        """
+        Writes the spans in the Trace Event Format read by chrome://tracing, Perfetto and speedscope. Each event carries
+        its game id in its args.
+        :param file: File-like object opened for text.
+        :param game_id: The id of the game to export, otherwise None for every game.
+        :return: Nothing.
+        """
+        pid = os.getpid()
+        events = [{'name': name, 'ph': 'X', 'ts': start / 1000, 'dur': duration / 1000, 'pid': pid, 'tid': thread,
+                   'args': {'game': game_id}}
+                  for name, thread, start, duration, stack, game_id in self.get_spans(game_id)]
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ns'}, file)
+
+    def export_folded(self, file, game_id=None):
+        """
+        Writes the spans as folded stacks, one 'caller;callee microseconds' line per call path with the time spent in
+        that path itself, as read by flamegraph.pl, inferno and speedscope.
+        :param file: File-like object opened for text.
+        :param game_id: The id of the game to export, otherwise None to combine every game.
+        :return: Nothing.
+        """
+        totals = collections.defaultdict(int)
+        for name, thread, start, duration, stack, span_game in self.get_spans(game_id):
+            totals[stack] += duration
+        children = collections.defaultdict(int)
+        for stack, duration in totals.items():
+            if len(stack) > 1:
+                children[stack[:-1]] += duration
+        for stack in sorted(totals):
+            self_time = max(0, totals[stack] - children[stack]) // 1000
+            if self_time:
+                file.write("%s %d\n" % (';'.join(stack), self_time))
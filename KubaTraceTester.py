@@ -0,0 +1,94 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for Kuba tracing.
+
+import io
+import json
+import unittest
+from KubaGame import KubaGame, KubaBoard
+from KubaTrace import KubaTracer
+
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        self.game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+
+    def test_methods_restored(self):
+        make_move = KubaGame.make_move
+        validate_move = KubaBoard.validate_move
+        with KubaTracer():
+            self.assertIsNot(KubaGame.make_move, make_move)
+        self.assertIs(KubaGame.make_move, make_move)
+        self.assertIs(KubaBoard.validate_move, validate_move)
+
+    def test_spans(self):
+        with KubaTracer() as tracer:
+            self.game.make_move('PlayerA', (6, 5), 'F')
+        spans = tracer.get_spans()
+        self.assertEqual(spans[-1][0], 'KubaGame.make_move')
+        self.assertEqual(spans[-1][4], ('KubaGame.make_move',))
+        stacks = set(span[4] for span in spans)
+        self.assertIn(('KubaGame.make_move', 'KubaBoard.move_marble'), stacks)
+        self.assertIn(('KubaGame.make_move', 'KubaBoard.has_won'), stacks)
+        self.assertTrue(all(span[3] >= 0 for span in spans))
+
+    def test_game_ids(self):
+        other = KubaGame(('PlayerC', 'W'), ('PlayerD', 'B'))
+        with KubaTracer() as tracer:
+            self.game.make_move('PlayerA', (6, 5), 'F')
+            other.make_move('PlayerC', (6, 5), 'F')
+        self.assertEqual((tracer.get_game_id(self.game), tracer.get_game_id(other)), (1, 2))
+        spans = tracer.get_spans(2)
+        self.assertEqual(spans[-1][0], 'KubaGame.make_move')
+        self.assertIn('KubaBoard.move_marble', [span[0] for span in spans])
+        self.assertEqual(len(spans) * 2, len(tracer.get_spans()))
+
+    def test_selected_games(self):
+        other = KubaGame(('PlayerC', 'W'), ('PlayerD', 'B'))
+        with KubaTracer(games={self.game: 'match-1'}) as tracer:
+            other.make_move('PlayerC', (6, 5), 'F')
+            self.game.make_move('PlayerA', (6, 5), 'F')
+            KubaBoard().get_marbles()
+        spans = tracer.get_spans()
+        self.assertEqual(set(span[5] for span in spans), {'match-1'})
+        self.assertEqual(spans, tracer.get_spans('match-1'))
+        self.assertIsNone(tracer.get_game_id(other))
+
+    def test_classmethods(self):
+        data = self.game.to_bytes()
+        from_bytes = vars(KubaGame)['from_bytes']
+        with KubaTracer() as tracer:
+            KubaGame.from_bytes(data)
+        self.assertIs(vars(KubaGame)['from_bytes'], from_bytes)
+        spans = tracer.get_spans()
+        self.assertEqual(spans[-1][0], 'KubaGame.from_bytes')
+        self.assertIsNone(spans[-1][5])
+
+    def test_ring_buffer(self):
+        with KubaTracer(capacity=5) as tracer:
+            self.game.make_move('PlayerA', (6, 5), 'F')
+        self.assertEqual(len(tracer.get_spans()), 5)
+
+    def test_one_tracer_at_a_time(self):
+        with KubaTracer():
+            self.assertRaises(RuntimeError, KubaTracer().start)
+
+    def test_exports(self):
+        with KubaTracer() as tracer:
+            self.game.make_move('PlayerA', (6, 5), 'F')
+        trace = io.StringIO()
+        tracer.export_chrome_trace(trace)
+        events = json.loads(trace.getvalue())['traceEvents']
+        self.assertEqual(len(events), len(tracer.get_spans()))
+        self.assertEqual(events[-1]['ph'], 'X')
+        self.assertEqual(events[-1]['args'], {'game': 1})
+        folded = io.StringIO()
+        tracer.export_folded(folded)
+        for line in folded.getvalue().splitlines():
+            stack, value = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('KubaGame.make_move'))
+            self.assertGreater(int(value), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
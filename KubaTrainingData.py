@@ -0,0 +1,240 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Exports Kuba positions and game outcomes as memory-mappable NumPy arrays for training a value network.
+
+import json
+import os
+import random
+import sys
+from KubaGame import KubaGame
+
+# Planes written for each position, each a 7x7 grid.
+PLANES = ('W', 'B', 'R', 'white_to_move', 'white_captured', 'black_captured')
+PLANE_SIZE = 49
+POSITION_SIZE = len(PLANES) * PLANE_SIZE
+
+
+def encode_position(game, slot):
+    """
+    Encodes a position as planes of bytes: one plane each marking the White, Black and Red marbles, a plane of ones if
+    the player to move plays White, and two planes filled with the number of Red marbles captured by the White and the
+    Black player.
+    :param game: KubaGame object.
+    :param slot: Integer, the slot (0 or 1) of the player to move.
+    :return: Bytes, len(PLANES) planes of 49 bytes in row order.
+    """
+    players = game.get_players()
+    data = bytearray(POSITION_SIZE)
+    offsets = {'W': 0, 'B': PLANE_SIZE, 'R': 2 * PLANE_SIZE}
+    for index, marble in enumerate(cell for row in game.get_board_state() for cell in row):
+        if marble is not None:
+            data[offsets[marble] + index] = 1
+
+    captured = {player.get_color(): player.get_captured_marbles() for player in players}
+    if players[slot].get_color() == 'W':
+        data[3 * PLANE_SIZE:4 * PLANE_SIZE] = b'\x01' * PLANE_SIZE
+    data[4 * PLANE_SIZE:5 * PLANE_SIZE] = bytes((captured.get('W', 0),)) * PLANE_SIZE
+    data[5 * PLANE_SIZE:6 * PLANE_SIZE] = bytes((captured.get('B', 0),)) * PLANE_SIZE
+    return bytes(data)
+
+
+def game_positions(players, moves):
+    """
+    Replays a game and returns the position before every successful move together with the outcome for the player who
+    made it: 1 if they went on to win, -1 if they lost and 0 if the game has no winner.
+    :param players: Tuple (String, String), the player names. The first plays White.
+    :param moves: Iterable of moves as (playername, coordinates, direction).
+    :return: List of Tuple (Bytes, Int), the encoded positions and outcomes.
+    """
+    game = KubaGame((players[0], 'W'), (players[1], 'B'))
+    positions = []
+    for playername, coordinates, direction in moves:
+        slot = game.get_player_slot(playername)
+        if slot is None:
+            continue
+        position = encode_position(game, slot)
+        if game.make_move(playername, coordinates, direction):
+            positions.append((position, playername))
+
+    winner = game.get_winner()
+    return [(position, 0 if winner is None else 1 if mover == winner else -1) for position, mover in positions]
+
+
+def self_play_games(count, seed=0, max_moves=300, search_depth=0):
+    """
+    Generates games by self-play. Moves are chosen at random, or by a shallow search if search_depth is set.
+    :param count: Integer, the number of games.
+    :param seed: Integer, the seed for the random choices.
+    :param max_moves: Integer, the longest game to play.
+    :param search_depth: Integer, the depth of the search used to choose moves, or 0 for random moves.
+    :return: Generator of Tuple (Tuple (String, String), List of moves), in the form read_archive produces.
+    """
+    rng = random.Random(seed)
+    players = ('PlayerA', 'PlayerB')
+    if search_depth:
+        from KubaSearch import best_move
+    for number in range(count):
+        game = KubaGame((players[0], 'W'), (players[1], 'B'))
+        moves = []
+        while len(moves) < max_moves and game.get_winner() is None:
+            candidates = game.get_possible_moves()
+            rng.shuffle(candidates)
+            move = best_move(game, search_depth)[1] if search_depth else None
+            if move is not None:
+                candidates.insert(0, move)
+            # Candidates may still be refused by the Ko rule.
+            for candidate in candidates:
+                if game.make_move(*candidate):
+                    moves.append(candidate)
+                    break
+            else:
+                break
+        yield players, moves
+
+
+class KubaDatasetWriter:
+    """
+    Writes positions to NumPy .npy files in fixed-size chunks. Each chunk is a memory-mapped array of shape
+    (positions, planes, 7, 7) of uint8 with a matching int8 array of outcomes, so only one chunk is ever held in memory
+    and the files can be opened with numpy.load(mmap_mode='r'). A JSON manifest lists the chunks and their sizes.
+    """
+    def __init__(self, prefix, chunk_size=1 << 20):
+        """
+        Initializes a writer.
+        :param prefix: String, the path prefix for the chunk files and the manifest.
+        :param chunk_size: Integer, the number of positions per chunk.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Writing training data requires NumPy.")
+        self._numpy = numpy
+        self._prefix = prefix
+        self._chunk_size = chunk_size
+        self._chunks = []
+        self._planes = None
+        self._outcomes = None
+        self._filled = 0
+        self._total = 0
+
+    def _chunk_paths(self, index):
+        """
+        Returns the file names of a chunk.
+        :param index: Integer, the chunk number.
+        :return: Tuple (String, String), the planes and outcomes files.
+        """
+        return "%s-%05d-planes.npy" % (self._prefix, index), "%s-%05d-outcomes.npy" % (self._prefix, index)
+
+    def _open_chunk(self):
+        """
+        Creates the next pair of chunk files.
+        :return: Nothing.
+        """
+        open_memmap = self._numpy.lib.format.open_memmap
+        planes_path, outcomes_path = self._chunk_paths(len(self._chunks))
+        self._planes = open_memmap(planes_path, mode='w+', dtype=self._numpy.uint8,
+                                   shape=(self._chunk_size, len(PLANES), 7, 7))
+        self._outcomes = open_memmap(outcomes_path, mode='w+', dtype=self._numpy.int8, shape=(self._chunk_size,))
+        self._chunks.append({'planes': os.path.basename(planes_path), 'outcomes': os.path.basename(outcomes_path),
+                             'count': 0})
+        self._filled = 0
+
+    def add(self, positions):
+        """
+        Adds positions to the dataset.
+        :param positions: Iterable of Tuple (Bytes, Int), encoded positions and outcomes as from game_positions.
+        :return: Nothing.
+        """
+        frombuffer = self._numpy.frombuffer
+        shape = (len(PLANES), 7, 7)
+        for position, outcome in positions:
+            if self._planes is None or self._filled == self._chunk_size:
+                self._finish_chunk()
+                self._open_chunk()
+            self._planes[self._filled] = frombuffer(position, dtype=self._numpy.uint8).reshape(shape)
+            self._outcomes[self._filled] = outcome
+            self._filled += 1
+            self._total += 1
+
+    def add_game(self, players, moves):
+        """
+        Replays a game and adds every position from it.
+        :param players: Tuple (String, String), the player names.
+        :param moves: Iterable of moves.
+        :return: Integer, the number of positions added.
+        """
+        positions = game_positions(players, moves)
+        self.add(positions)
+        return len(positions)
+
+    def _finish_chunk(self):
+        """
+        Flushes the current chunk to disk. A partly filled final chunk is rewritten at its exact size.
+        :return: Nothing.
+        """
+        if self._planes is None:
+            return
+        self._chunks[-1]['count'] = self._filled
+        planes, outcomes = self._planes, self._outcomes
+        self._planes = self._outcomes = None
+        if self._filled == self._chunk_size:
+            planes.flush()
+            outcomes.flush()
+            return
+
+        planes_path, outcomes_path = self._chunk_paths(len(self._chunks) - 1)
+        planes_data = self._numpy.array(planes[:self._filled])
+        outcomes_data = self._numpy.array(outcomes[:self._filled])
+        del planes, outcomes
+        self._numpy.save(planes_path, planes_data)
+        self._numpy.save(outcomes_path, outcomes_data)
+
+    def close(self):
+        """
+        Finishes the last chunk and writes the manifest.
+        :return: Integer, the total number of positions written.
+        """
+        self._finish_chunk()
+        with open(self._prefix + "-manifest.json", "w") as manifest:
+            json.dump({'planes': list(PLANES), 'positions': self._total, 'chunks': self._chunks}, manifest)
+        return self._total
+
+
+def load_dataset(prefix):
+    """
+    Opens every chunk of a dataset as read-only memory maps, without reading the data into memory.
+    :param prefix: String, the prefix the dataset was written with.
+    :return: List of Tuple (numpy.memmap, numpy.memmap), the planes and outcomes of each chunk.
+    """
+    import numpy
+    directory = os.path.dirname(prefix)
+    with open(prefix + "-manifest.json") as manifest:
+        chunks = json.load(manifest)['chunks']
+    return [(numpy.load(os.path.join(directory, chunk['planes']), mmap_mode='r'),
+             numpy.load(os.path.join(directory, chunk['outcomes']), mmap_mode='r')) for chunk in chunks]
+
+
+def main():
+    # Usage: python KubaTrainingData.py prefix (--self-play=N | archive [archive ...]) [--seed=S] [--depth=D]
+    #        [--chunk=N]
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[2:] if arg.startswith("--") and "=" in arg)
+    archives = [arg for arg in sys.argv[2:] if not arg.startswith("--")]
+    writer = KubaDatasetWriter(sys.argv[1], int(options.get('chunk', 1 << 20)))
+
+    if 'self-play' in options:
+        games = self_play_games(int(options['self-play']), int(options.get('seed', 0)),
+                                search_depth=int(options.get('depth', 0)))
+        for players, moves in games:
+            writer.add_game(players, moves)
+    else:
+        from KubaAnalytics import read_archive
+        for path in archives:
+            with open(path) as archive:
+                for players, moves in read_archive(archive):
+                    writer.add_game(players, moves)
+
+    print("Wrote", writer.close(), "positions.")
+
+
+if __name__ == "__main__":
+    main()
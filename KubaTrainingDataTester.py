@@ -0,0 +1,73 @@
+# Author: Marc Zalik
+# Date: 2026-10-19
+# Description: Unit tests for the Kuba training data exporter.
+
+import os
+import tempfile
+import unittest
+from KubaGame import KubaGame
+from KubaAnalytics import read_archive
+from KubaAnalyticsTester import WIN_GAME
+from KubaTrainingData import PLANE_SIZE, POSITION_SIZE, encode_position, game_positions, self_play_games
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestTrainingData(unittest.TestCase):
+    def test_encode_position(self):
+        game = KubaGame(('PlayerA', 'W'), ('PlayerB', 'B'))
+        data = encode_position(game, 0)
+        self.assertEqual(len(data), POSITION_SIZE)
+        planes = [data[num * PLANE_SIZE:(num + 1) * PLANE_SIZE] for num in range(POSITION_SIZE // PLANE_SIZE)]
+        self.assertEqual([sum(plane) for plane in planes[:3]], [8, 8, 13])
+        self.assertEqual(planes[0][0], 1)
+        self.assertEqual(planes[1][6], 1)
+        self.assertEqual(planes[2][24], 1)
+        self.assertEqual(planes[3], b'\x01' * PLANE_SIZE)
+        self.assertEqual(encode_position(game, 1)[3 * PLANE_SIZE:4 * PLANE_SIZE], bytes(PLANE_SIZE))
+        self.assertEqual(planes[4] + planes[5], bytes(2 * PLANE_SIZE))
+
+    def test_game_positions(self):
+        (players, moves), = read_archive(WIN_GAME)
+        positions = game_positions(players, moves)
+        self.assertEqual(len(positions), 23)
+        self.assertEqual([outcome for position, outcome in positions[:4]], [1, -1, 1, -1])
+        # The winner had captured six Red marbles before the last move.
+        self.assertEqual(positions[-1][0][4 * PLANE_SIZE], 6)
+
+    def test_undecided_and_refused_moves(self):
+        moves = [('PlayerA', (6, 5), 'F'), ('PlayerA', (6, 5), 'F'), ('PlayerC', (0, 0), 'R'),
+                 ('PlayerB', (0, 5), 'B')]
+        positions = game_positions(('PlayerA', 'PlayerB'), moves)
+        self.assertEqual([outcome for position, outcome in positions], [0, 0])
+
+    def test_self_play(self):
+        games = list(self_play_games(2, seed=3, max_moves=40))
+        self.assertEqual(len(games), 2)
+        self.assertEqual(games, list(self_play_games(2, seed=3, max_moves=40)))
+        for players, moves in games:
+            self.assertLessEqual(len(moves), 40)
+            self.assertEqual(len(game_positions(players, moves)), len(moves))
+
+    @unittest.skipUnless(numpy, "NumPy is not installed")
+    def test_writer_chunks(self):
+        from KubaTrainingData import KubaDatasetWriter, load_dataset
+        (players, moves), = read_archive(WIN_GAME)
+        with tempfile.TemporaryDirectory() as directory:
+            prefix = os.path.join(directory, "kuba")
+            writer = KubaDatasetWriter(prefix, chunk_size=10)
+            self.assertEqual(writer.add_game(players, moves), 23)
+            self.assertEqual(writer.close(), 23)
+            chunks = load_dataset(prefix)
+            self.assertEqual([len(outcomes) for planes, outcomes in chunks], [10, 10, 3])
+            self.assertEqual(chunks[0][0].shape, (10, 6, 7, 7))
+            self.assertEqual(list(chunks[0][1][:2]), [1, -1])
+            positions = game_positions(players, moves)
+            self.assertEqual(chunks[2][0][2].tobytes(), positions[-1][0])
+
+
+if __name__ == '__main__':
+    unittest.main()